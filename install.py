@@ -26,7 +26,8 @@ def setup_logger():
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
     
-    log_file = log_dir / f'install_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
+    # 同一天的安装日志追加到同一个文件
+    log_file = log_dir / f'install_{datetime.now():%Y%m%d}.log'
     
     logging.basicConfig(
         level=logging.INFO,
@@ -36,9 +37,10 @@ def setup_logger():
             logging.StreamHandler()
         ]
     )
-    return logging.getLogger(__name__)
+    return logger
 
-logger = setup_logger()
+# 日志处理器在main()中配置，导入本模块时不创建日志文件
+logger = logging.getLogger(__name__)
 
 def check_python_version():
     """检查Python版本是否满足要求"""
@@ -64,18 +66,29 @@ def install_requirements():
     """安装所有依赖包"""
     logger.info("开始安装依赖包...")
     requirements = [
-        'pandas',
         'openpyxl',
         'python-docx',
-        'PyPDF2',
+        'pymupdf',
+        'pyahocorasick',
+        'orjson',
+        'zstandard',
         'pyinstaller'
     ]
     
-    all_success = True
-    for package in requirements:
-        if not install_package(package):
-            all_success = False
-    
+    # 一次pip调用安装全部依赖，只需解析一次依赖关系
+    try:
+        subprocess.check_call([
+            sys.executable, '-m', 'pip', 'install', '--upgrade', '--no-input', *requirements
+        ])
+        all_success = True
+    except subprocess.CalledProcessError as e:
+        # 批量安装失败时逐个重试，以便定位具体失败的包
+        logger.warning(f"批量安装依赖失败: {e}，改为逐个安装")
+        all_success = True
+        for package in requirements:
+            if not install_package(package):
+                all_success = False
+
     if all_success:
         logger.info("所有依赖包安装完成")
     else:
@@ -114,7 +127,16 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # 运行时用不到的模块，排除后可减小体积、加快启动
+    excludes=[
+        'tkinter.test',
+        'unittest',
+        'pydoc',
+        'setuptools',
+        'pandas',
+        'numpy.tests',
+        'PIL.ImageTk',
+    ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -133,7 +155,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX压缩会让每个DLL在启动时先解压，拖慢程序启动
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
@@ -145,8 +168,9 @@ exe = EXE(
     icon='icon.ico',
 )
 '''
-        # 创建图标文件
-        create_icon()
+        # 创建图标文件，spec中的icon=依赖它
+        if not create_icon():
+            return False
         
         # 保存spec文件
         with open('analyzer.spec', 'w', encoding='utf-8') as f:
@@ -159,6 +183,8 @@ exe = EXE(
             '-m',
             'PyInstaller',
             '--clean',
+            '--noconfirm',
+            '--log-level=WARN',
             'analyzer.spec'
         ])
         
@@ -223,6 +249,7 @@ def setup():
 
 def main():
     """程序入口"""
+    setup_logger()
     try:
         if setup():
             input("\n按回车键退出...")
@@ -23,9 +23,11 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "pandas",
         "python-docx",
-        "PyPDF2",
+        "pymupdf",
+        "pyahocorasick",
+        "orjson",
+        "zstandard",
         "openpyxl",
     ],
     entry_points={
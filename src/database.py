@@ -2,8 +2,91 @@
 import sqlite3
 from pathlib import Path
 import logging
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Tuple
 import json
+import threading
+from contextlib import contextmanager
+try:
+    import orjson  # C实现的JSON库，序列化和反序列化都比标准库json快得多
+except ImportError:
+    orjson = None
+try:
+    import zstandard  # 压缩较大的JSON数据，减小数据库体积和读取的数据量
+except ImportError:
+    zstandard = None
+
+# zstd压缩帧的魔数，用于区分压缩的BLOB和普通JSON文本
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+# 单条SQL语句绑定的参数个数（旧版SQLite的上限为999）
+_SQL_PARAM_BATCH = 500
+# 超过该长度的JSON才压缩，很短的数据压缩收益抵不过开销
+_COMPRESS_MIN_LENGTH = 1024
+# SQLite 3.35起支持用MATERIALIZED要求CTE先单独求值
+_CTE_MATERIALIZED = "MATERIALIZED" if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+
+
+def _dumps_json(data) -> str:
+    """将数据序列化为JSON字符串（保留中文字符）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _loads_json(text):
+    """解析JSON字符串"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _encode_json(data) -> Union[str, bytes]:
+    """序列化为JSON，安装了zstandard且数据较大时压缩为BLOB"""
+    text = _dumps_json(data)
+    if zstandard is not None and len(text) >= _COMPRESS_MIN_LENGTH:
+        return zstandard.ZstdCompressor(level=3).compress(text.encode('utf-8'))
+    return text
+
+
+def _json_text(value: Union[str, bytes]) -> str:
+    """取出数据库中保存的JSON文本，压缩的BLOB先解压"""
+    if isinstance(value, bytes):
+        if value.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("数据经过zstd压缩，需要安装zstandard才能读取")
+            value = zstandard.ZstdDecompressor().decompress(value)
+        return value.decode('utf-8')
+    return value
+
+
+def _decode_json(value: Union[str, bytes]):
+    """解析数据库中保存的JSON（文本或压缩的BLOB）"""
+    return _loads_json(_json_text(value))
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """将查询结果转换为字典列表，列名只从cursor.description读取一次"""
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def _fetch_dict(cursor: sqlite3.Cursor) -> Optional[Dict]:
+    """读取一行查询结果并转换为字典，没有结果时返回None"""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+def _iter_dicts(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[Dict]:
+    """分批读取查询结果并逐行生成字典，内存占用与结果总数无关"""
+    names = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(names, row))
+
 
 class DatabaseManager:
     """数据库管理器类"""
@@ -22,7 +105,7 @@ class DatabaseManager:
             bool: 是否更新成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -32,7 +115,6 @@ class DatabaseManager:
                     """,
                     (new_keyword, category, description, old_keyword)
                 )
-                conn.commit()
                 self.logger.info(f"关键词更新成功: {old_keyword} -> {new_keyword}")
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -50,18 +132,63 @@ class DatabaseManager:
             bool: 是否删除成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "DELETE FROM keywords WHERE keyword = ?",
                     (keyword,)
                 )
-                conn.commit()
                 self.logger.info(f"关键词删除成功: {keyword}")
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             self.logger.error(f"删除关键词失败: {e}")
             return False
+
+    def delete_keywords_bulk(self, keywords: Iterable[str]) -> int:
+        """
+        批量删除关键词，在同一个事务中完成，只提交一次
+        
+        Args:
+            keywords: 要删除的关键词
+            
+        Returns:
+            int: 实际删除的关键词数量
+        """
+        keywords = list(keywords)
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                deleted = 0
+                # 每条语句用IN一次删除一批，批大小低于SQLite的参数个数上限
+                for start in range(0, len(keywords), _SQL_PARAM_BATCH):
+                    batch = keywords[start:start + _SQL_PARAM_BATCH]
+                    cursor.execute(
+                        f"DELETE FROM keywords WHERE keyword IN ({', '.join('?' * len(batch))})",
+                        batch
+                    )
+                    deleted += cursor.rowcount
+                self.logger.info(f"批量删除关键词完成: 删除 {deleted} 个")
+                return deleted
+        except sqlite3.Error as e:
+            self.logger.error(f"批量删除关键词失败: {e}")
+            return 0
+
+    def delete_all_keywords(self) -> bool:
+        """
+        删除所有关键词
+        
+        Returns:
+            bool: 是否删除成功
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM keywords")
+                self.logger.info(f"已删除所有关键词，共 {cursor.rowcount} 个")
+                return True
+        except sqlite3.Error as e:
+            self.logger.error(f"删除所有关键词失败: {e}")
+            return False
     
     def __init__(self, db_path: Union[str, Path] = None):
         """
@@ -77,14 +204,71 @@ class DatabaseManager:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.logger = logging.getLogger(__name__)
+        # 所有方法共用一个长连接，避免每次调用都重新打开数据库、解析表结构；
+        # GUI会在后台线程中访问数据库，因此用锁串行化对连接的使用
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._conn = self._connect()
         self._init_database()
     
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        在一个事务中执行数据库操作，正常结束时提交，出现异常时回滚
+        
+        可以嵌套使用：嵌套的事务并入最外层事务，只在最外层结束时提交一次，
+        因此多次调用本类的方法可以合并为一次提交。
+        
+        Yields:
+            sqlite3.Connection: 数据库连接
+        """
+        with self._lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield self._conn
+                finally:
+                    self._transaction_depth -= 1
+                return
+            self._transaction_depth = 1
+            try:
+                yield self._conn
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库连接并设置连接级别的PRAGMA
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL模式下NORMAL同步只在检查点时fsync，程序崩溃也不会损坏数据库
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-40000")  # 约40MB页缓存
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB内存映射
+        return conn
+    
     def _init_database(self):
         """初始化数据库表结构"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
+                # WAL日志模式保存在数据库文件中，设置一次即可；读写互不阻塞
+                cursor.execute("PRAGMA journal_mode=WAL")
+                
                 # 创建关键词表
                 cursor.execute("""
                 CREATE TABLE IF NOT EXISTS keywords (
@@ -106,20 +290,141 @@ class DatabaseManager:
                     analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     keyword_stats JSON,
                     total_keywords INTEGER,
+                    total_occurrences INTEGER,
                     file_type TEXT,
                     file_size INTEGER,
                     status TEXT,
                     notes TEXT
                 )
                 """)
+                self._migrate_total_occurrences(cursor)
+                
+                # 按状态过滤并按分析日期排序、按类别排序关键词时直接走索引
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ps_status_date
+                ON project_summaries (status, analysis_date DESC)
+                """)
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ps_date
+                ON project_summaries (analysis_date DESC)
+                """)
+                # 按项目名称取最近一次分析时走索引
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ps_name_date
+                ON project_summaries (project_name, analysis_date DESC)
+                """)
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_keywords_category
+                ON keywords (category, keyword)
+                """)
+                
+                # 创建文档分析结果缓存表
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache_results (
+                    file_hash TEXT NOT NULL,
+                    keywords_hash TEXT NOT NULL,
+                    results_json TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (file_hash, keywords_hash)
+                )
+                """)
+                
+                # 创建文档文本缓存表，关键词变化后无需重新解析文档
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache_text (
+                    file_hash TEXT PRIMARY KEY,
+                    pages_json TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
                 
-                conn.commit()
+                self._fts_enabled = self._init_fts(
+                    cursor, 'project_summaries', ('project_name', 'notes')
+                )
+                self._keywords_fts_enabled = self._init_fts(
+                    cursor, 'keywords', ('keyword', 'category', 'description')
+                )
                 self.logger.info("数据库表初始化完成")
                 
         except sqlite3.Error as e:
             self.logger.error(f"数据库初始化失败: {e}")
             raise
     
+    def _migrate_total_occurrences(self, cursor: sqlite3.Cursor):
+        """
+        为旧数据库的项目摘要表添加关键词总出现次数列，并根据已有的关键词统计回填
+        
+        Args:
+            cursor: 数据库游标
+        """
+        cursor.execute("PRAGMA table_info(project_summaries)")
+        if any(column[1] == 'total_occurrences' for column in cursor.fetchall()):
+            return
+        cursor.execute("ALTER TABLE project_summaries ADD COLUMN total_occurrences INTEGER")
+        cursor.execute("SELECT id, keyword_stats FROM project_summaries")
+        updates = [
+            (sum(_decode_json(stats).values()) if stats else 0, project_id)
+            for project_id, stats in cursor.fetchall()
+        ]
+        cursor.executemany(
+            "UPDATE project_summaries SET total_occurrences = ? WHERE id = ?", updates
+        )
+        self.logger.info(f"已为{len(updates)}条项目摘要回填关键词总出现次数")
+    
+    def _init_fts(self, cursor: sqlite3.Cursor, table: str, columns: Tuple[str, ...]) -> bool:
+        """
+        为表的文本列创建全文索引（trigram分词，支持中文子串搜索）
+        
+        Args:
+            cursor: 数据库游标
+            table: 表名，全文索引表名为 {table}_fts，以表的id列作为rowid
+            columns: 要建立索引的列
+            
+        Returns:
+            bool: 全文索引是否可用（SQLite未编译FTS5或版本低于3.34时不可用）
+        """
+        fts = f"{table}_fts"
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            )
+            exists = cursor.fetchone() is not None
+            cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+            USING fts5({column_list}, content='{table}', content_rowid='id', tokenize='trigram')
+            """)
+            # 通过触发器让全文索引与原表保持同步
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list})
+                VALUES (new.id, {new_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list})
+                VALUES (new.id, {new_values});
+            END
+            """)
+            if not exists:
+                # 已有数据库第一次创建全文索引时，为已有记录建立索引
+                cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"{table}全文索引不可用，搜索将使用LIKE: {e}")
+            return False
+    
     def add_keyword(self, keyword: str, category: str = None, description: str = None) -> bool:
         """
         添加关键词
@@ -133,7 +438,7 @@ class DatabaseManager:
             bool: 是否添加成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -142,7 +447,6 @@ class DatabaseManager:
                     """,
                     (keyword, category, description)
                 )
-                conn.commit()
                 self.logger.info(f"关键词添加成功: {keyword}")
                 return True
         except sqlite3.IntegrityError:
@@ -152,23 +456,274 @@ class DatabaseManager:
             self.logger.error(f"添加关键词失败: {e}")
             return False
     
-    def get_all_keywords(self) -> List[Dict]:
+    def add_keywords_bulk(
+        self, keywords: Iterable[Union[str, Tuple[str, Optional[str], Optional[str]]]]
+    ) -> int:
+        """
+        批量添加关键词，所有关键词在同一个事务中用同一条预编译语句写入，只提交一次
+        
+        Args:
+            keywords: 关键词，或（关键词, 类别, 描述）元组；已存在的关键词会被忽略
+            
+        Returns:
+            int: 实际新增的关键词数量
+        """
+        rows = [
+            (item, None, None) if isinstance(item, str) else tuple(item)
+            for item in keywords
+        ]
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO keywords (keyword, category, description) "
+                    "VALUES (?, ?, ?)",
+                    rows
+                )
+                self.logger.info(f"批量添加关键词完成: 新增 {cursor.rowcount} 个")
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            self.logger.error(f"批量添加关键词失败: {e}")
+            return 0
+    
+    def get_cached_results(self, file_hash: str, keywords_hash: str) -> Optional[List[Dict]]:
+        """
+        获取缓存的文档分析结果
+        
+        Args:
+            file_hash: 文件内容哈希
+            keywords_hash: 关键词集合哈希
+            
+        Returns:
+            Optional[List[Dict]]: 分析结果，未命中缓存时返回None
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT results_json FROM cache_results "
+                    "WHERE file_hash = ? AND keywords_hash = ?",
+                    (file_hash, keywords_hash)
+                )
+                row = cursor.fetchone()
+                return _decode_json(row[0]) if row else None
+        except sqlite3.Error as e:
+            self.logger.error(f"读取分析结果缓存失败: {e}")
+            return None
+    
+    def save_cached_results(self, file_hash: str, keywords_hash: str, results: List[Dict],
+                            max_entries: int = 50) -> bool:
+        """
+        缓存文档分析结果，只保留最近的max_entries条
+        
+        Args:
+            file_hash: 文件内容哈希
+            keywords_hash: 关键词集合哈希
+            results: 分析结果
+            max_entries: 最多保留的缓存条数
+            
+        Returns:
+            bool: 是否缓存成功
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO cache_results (file_hash, keywords_hash, results_json)
+                    VALUES (?, ?, ?)
+                    """,
+                    (file_hash, keywords_hash, _encode_json(results))
+                )
+                cursor.execute(
+                    """
+                    DELETE FROM cache_results WHERE rowid NOT IN (
+                        SELECT rowid FROM cache_results ORDER BY created_at DESC, rowid DESC LIMIT ?
+                    )
+                    """,
+                    (max_entries,)
+                )
+                return True
+        except sqlite3.Error as e:
+            self.logger.error(f"保存分析结果缓存失败: {e}")
+            return False
+    
+    def get_cached_text(self, file_hash: str) -> Optional[List[Dict]]:
+        """
+        获取缓存的文档文本
+        
+        Args:
+            file_hash: 文件内容哈希
+            
+        Returns:
+            Optional[List[Dict]]: 按页提取的文本，未命中缓存时返回None
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT pages_json FROM cache_text WHERE file_hash = ?",
+                    (file_hash,)
+                )
+                row = cursor.fetchone()
+                return _decode_json(row[0]) if row else None
+        except sqlite3.Error as e:
+            self.logger.error(f"读取文档文本缓存失败: {e}")
+            return None
+    
+    def save_cached_text(self, file_hash: str, pages_content: List[Dict],
+                         max_entries: int = 20) -> bool:
+        """
+        缓存文档文本，只保留最近的max_entries份文档
+        
+        Args:
+            file_hash: 文件内容哈希
+            pages_content: 按页提取的文本
+            max_entries: 最多保留的文档数
+            
+        Returns:
+            bool: 是否缓存成功
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT OR REPLACE INTO cache_text (file_hash, pages_json) VALUES (?, ?)",
+                    (file_hash, _encode_json(pages_content))
+                )
+                cursor.execute(
+                    """
+                    DELETE FROM cache_text WHERE rowid NOT IN (
+                        SELECT rowid FROM cache_text ORDER BY created_at DESC, rowid DESC LIMIT ?
+                    )
+                    """,
+                    (max_entries,)
+                )
+                return True
+        except sqlite3.Error as e:
+            self.logger.error(f"保存文档文本缓存失败: {e}")
+            return False
+    
+    def get_all_keywords(self, limit: int = None, offset: int = 0) -> List[Dict]:
         """
         获取所有关键词
         
+        Args:
+            limit: 返回记录数限制，为None时返回全部关键词
+            offset: 起始位置偏移
+            
         Returns:
             List[Dict]: 关键词列表
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM keywords ORDER BY category, keyword")
-                return [dict(row) for row in cursor.fetchall()]
+                cursor.execute(
+                    "SELECT * FROM keywords ORDER BY category, keyword LIMIT ? OFFSET ?",
+                    (-1 if limit is None else limit, offset)
+                )
+                return _fetch_dicts(cursor)
         except sqlite3.Error as e:
             self.logger.error(f"获取关键词失败: {e}")
             return []
     
+    def count_keywords(self) -> int:
+        """
+        获取关键词总数
+        
+        Returns:
+            int: 关键词数量
+        """
+        try:
+            with self.transaction() as conn:
+                return conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"获取关键词数量失败: {e}")
+            return 0
+    
+    def get_keyword_categories(self) -> List[str]:
+        """
+        获取所有关键词分类
+        
+        Returns:
+            List[str]: 按名称排序的非空分类
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.execute(
+                    """
+                    SELECT DISTINCT category FROM keywords
+                    WHERE category IS NOT NULL AND category != ''
+                    ORDER BY category
+                    """
+                )
+                return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"获取关键词分类失败: {e}")
+            return []
+    
+    def search_keywords(self, term: str, category: str = None) -> List[Dict]:
+        """
+        在关键词、分类和描述中搜索关键词
+        
+        Args:
+            term: 搜索词，以空白分隔的多个词须全部出现
+            category: 只返回该分类的关键词，为None时不限分类
+            
+        Returns:
+            List[Dict]: 匹配的关键词列表，排序与get_all_keywords相同
+        """
+        tokens = list(dict.fromkeys(term.split()))
+        # trigram全文索引只能匹配至少3个字符的子串，更短的词仍用LIKE
+        if self._keywords_fts_enabled:
+            fts_tokens = [token for token in tokens if len(token) >= 3]
+        else:
+            fts_tokens = []
+        filters = []
+        params = []
+        for token in tokens:
+            if token not in fts_tokens:
+                filters.append("(k.keyword LIKE ? OR k.category LIKE ? OR k.description LIKE ?)")
+                params.extend([f"%{token}%"] * 3)
+        if category is not None:
+            filters.append("k.category = ?")
+            params.append(category)
+        where = " AND ".join(filters) or "1"
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                
+                if fts_tokens:
+                    # 先在CTE中取出全文索引的命中结果，再按其余条件过滤，
+                    # 避免过滤条件与MATCH写在同一个WHERE中时查询计划不走全文索引
+                    cursor.execute(
+                        f"""
+                        WITH matches AS {_CTE_MATERIALIZED} (
+                            SELECT rowid FROM keywords_fts WHERE keywords_fts MATCH ?
+                        )
+                        SELECT k.* FROM matches JOIN keywords k ON k.id = matches.rowid
+                        WHERE {where}
+                        ORDER BY k.category, k.keyword
+                        """,
+                        (
+                            " ".join('"' + token.replace('"', '""') + '"' for token in fts_tokens),
+                            *params,
+                        )
+                    )
+                else:
+                    cursor.execute(
+                        f"""
+                        SELECT * FROM keywords k
+                        WHERE {where}
+                        ORDER BY k.category, k.keyword
+                        """,
+                        params
+                    )
+                return _fetch_dicts(cursor)
+        except sqlite3.Error as e:
+            self.logger.error(f"搜索关键词失败: {e}")
+            return []
+    
     def add_project_summary(self, 
                           project_name: str,
                           file_path: str,
@@ -193,27 +748,27 @@ class DatabaseManager:
             Optional[int]: 项目ID，如果添加失败则返回None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
                     INSERT INTO project_summaries 
-                    (project_name, file_path, keyword_stats, total_keywords,
+                    (project_name, file_path, keyword_stats, total_keywords, total_occurrences,
                      file_type, file_size, status, notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         project_name,
                         file_path,
-                        json.dumps(keyword_stats, ensure_ascii=False),
+                        _encode_json(keyword_stats),
                         len(keyword_stats),
+                        sum(keyword_stats.values()),
                         file_type,
                         file_size,
                         status,
                         notes
                     )
                 )
-                conn.commit()
                 self.logger.info(f"项目摘要添加成功: {project_name}")
                 return cursor.lastrowid
         except sqlite3.Error as e:
@@ -223,7 +778,8 @@ class DatabaseManager:
     def get_project_summaries(self, 
                             limit: int = 100,
                             offset: int = 0,
-                            status: str = None) -> List[Dict]:
+                            status: str = None,
+                            raw_json: bool = False) -> List[Dict]:
         """
         获取项目分析摘要列表
         
@@ -231,13 +787,13 @@ class DatabaseManager:
             limit: 返回记录数限制
             offset: 起始位置偏移
             status: 分析状态过滤
+            raw_json: 为True时keyword_stats以JSON字符串返回，不做解析
             
         Returns:
             List[Dict]: 项目摘要列表
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM project_summaries"
@@ -252,11 +808,10 @@ class DatabaseManager:
                 
                 cursor.execute(query, params)
                 
-                results = []
-                for row in cursor.fetchall():
-                    record = dict(row)
-                    record['keyword_stats'] = json.loads(record['keyword_stats'])
-                    results.append(record)
+                results = _fetch_dicts(cursor)
+                decode = _json_text if raw_json else _decode_json
+                for record in results:
+                    record['keyword_stats'] = decode(record['keyword_stats'])
                 
                 return results
                 
@@ -264,6 +819,92 @@ class DatabaseManager:
             self.logger.error(f"获取项目摘要失败: {e}")
             return []
     
+    def iter_project_summaries(self,
+                               status: str = None,
+                               raw_json: bool = False,
+                               batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        逐条遍历全部项目分析摘要，结果按批读取，不会一次性载入内存
+        
+        Args:
+            status: 分析状态过滤
+            raw_json: 为True时keyword_stats以JSON字符串返回，不做解析
+            batch_size: 每次从数据库读取的记录数
+            
+        Yields:
+            Dict: 项目摘要
+        """
+        # 使用独立的只读连接，遍历期间不占用共享连接的锁（WAL模式下读写互不阻塞）
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.arraysize = batch_size
+            if status:
+                cursor.execute(
+                    "SELECT * FROM project_summaries WHERE status = ? ORDER BY analysis_date DESC",
+                    (status,)
+                )
+            else:
+                cursor.execute("SELECT * FROM project_summaries ORDER BY analysis_date DESC")
+            for record in _iter_dicts(cursor, batch_size):
+                if raw_json:
+                    record['keyword_stats'] = _json_text(record['keyword_stats'])
+                else:
+                    record['keyword_stats'] = _decode_json(record['keyword_stats'])
+                yield record
+        except sqlite3.Error as e:
+            self.logger.error(f"遍历项目摘要失败: {e}")
+        finally:
+            conn.close()
+    
+    def get_project_usage_stats(self) -> List[Dict]:
+        """
+        获取每个项目最近一次分析的关键词统计（同名项目的多次分析只取最近一次）
+        
+        Returns:
+            List[Dict]: 包含project_name、analysis_date、total_keywords（发现关键词数）
+                和total_occurrences（关键词总出现次数）的列表，按总出现次数降序、项目名称升序排列
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT project_name, analysis_date,
+                           COALESCE(total_keywords, 0) AS total_keywords,
+                           COALESCE(total_occurrences, 0) AS total_occurrences
+                    FROM project_summaries p
+                    WHERE project_name != '' AND id = (
+                        SELECT id FROM project_summaries
+                        WHERE project_name = p.project_name
+                        ORDER BY analysis_date DESC, id DESC
+                        LIMIT 1
+                    )
+                    ORDER BY total_occurrences DESC, project_name
+                    """
+                )
+                return _fetch_dicts(cursor)
+        except sqlite3.Error as e:
+            self.logger.error(f"获取项目统计失败: {e}")
+            return []
+    
+    def get_change_version(self) -> Optional[Tuple[int, int]]:
+        """
+        获取数据库的变更版本，数据库有任何写入后返回值都会变化
+        
+        data_version只在其他连接提交修改后变化，因此再加上本连接累计修改的行数。
+        
+        Returns:
+            Optional[Tuple[int, int]]: (data_version, 本连接的total_changes)，读取失败时返回None
+        """
+        try:
+            with self.transaction() as conn:
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                return data_version, conn.total_changes
+        except sqlite3.Error as e:
+            self.logger.error(f"获取数据库变更版本失败: {e}")
+            return None
+    
     def search_projects(self, keyword: str) -> List[Dict]:
         """
         搜索项目
@@ -275,24 +916,35 @@ class DatabaseManager:
             List[Dict]: 匹配的项目列表
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute(
-                    """
-                    SELECT * FROM project_summaries
-                    WHERE project_name LIKE ? OR notes LIKE ?
-                    ORDER BY analysis_date DESC
-                    """,
-                    (f"%{keyword}%", f"%{keyword}%")
-                )
+                # trigram全文索引只能匹配至少3个字符的子串，更短的搜索词仍用LIKE
+                if self._fts_enabled and len(keyword) >= 3:
+                    cursor.execute(
+                        """
+                        SELECT * FROM project_summaries
+                        WHERE id IN (
+                            SELECT rowid FROM project_summaries_fts
+                            WHERE project_summaries_fts MATCH ?
+                        )
+                        ORDER BY analysis_date DESC
+                        """,
+                        ('"' + keyword.replace('"', '""') + '"',)
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        SELECT * FROM project_summaries
+                        WHERE project_name LIKE ? OR notes LIKE ?
+                        ORDER BY analysis_date DESC
+                        """,
+                        (f"%{keyword}%", f"%{keyword}%")
+                    )
                 
-                results = []
-                for row in cursor.fetchall():
-                    record = dict(row)
-                    record['keyword_stats'] = json.loads(record['keyword_stats'])
-                    results.append(record)
+                results = _fetch_dicts(cursor)
+                for record in results:
+                    record['keyword_stats'] = _decode_json(record['keyword_stats'])
                 
                 return results
                 
@@ -300,19 +952,19 @@ class DatabaseManager:
             self.logger.error(f"搜索项目失败: {e}")
             return []
     
-    def get_project_detail(self, project_id: int) -> Optional[Dict]:
+    def get_project_detail(self, project_id: int, raw_json: bool = False) -> Optional[Dict]:
         """
         获取项目详细信息
         
         Args:
             project_id: 项目ID
+            raw_json: 为True时keyword_stats以JSON字符串返回，不做解析
             
         Returns:
             Optional[Dict]: 项目详细信息
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute(
@@ -320,10 +972,12 @@ class DatabaseManager:
                     (project_id,)
                 )
                 
-                row = cursor.fetchone()
-                if row:
-                    record = dict(row)
-                    record['keyword_stats'] = json.loads(record['keyword_stats'])
+                record = _fetch_dict(cursor)
+                if record:
+                    if raw_json:
+                        record['keyword_stats'] = _json_text(record['keyword_stats'])
+                    else:
+                        record['keyword_stats'] = _decode_json(record['keyword_stats'])
                     return record
                 
                 return None
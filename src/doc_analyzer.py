@@ -1,19 +1,135 @@
+import bisect
+import hashlib
 import os
-from typing import List, Dict, Set, Optional
-import PyPDF2
-from docx import Document
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import AbstractSet, Callable, List, Dict, Set, Optional, Iterable, Sequence
+try:
+    import pymupdf as fitz  # PyMuPDF，基于MuPDF的C实现，文本提取速度远快于PyPDF2
+except ImportError:
+    fitz = None
+    import PyPDF2
+try:
+    import ahocorasick  # 多模式匹配自动机，一次扫描即可找出全部关键词
+except ImportError:
+    ahocorasick = None
 import logging
+import multiprocessing
 from pathlib import Path
 try:
     from src.database import DatabaseManager
 except ImportError:
     from database import DatabaseManager
 import argparse
-import openpyxl
-from openpyxl.styles import Font, PatternFill
+
+# 页数达到该值时才用多进程提取PDF文本，避免小文档承担进程启动开销
+PARALLEL_PDF_MIN_PAGES = 8
+# 每个工作进程一次领取的页数
+PDF_PAGES_PER_TASK = 4
+
+# 章节编号，按顺序尝试各种写法
+_SECTION_RE = re.compile(
+    r'第[一二三四五六七八九十百零]+章'  # 中文数字章节
+    r'|第\d+章'                      # 阿拉伯数字章节
+    r'|\d+\.\d+(?:\.\d+)?'            # 数字编号（如1.2, 1.2.3）
+    r'|[一二三四五六七八九十]+、'      # 中文数字编号
+    r'|\d+、'                         # 阿拉伯数字编号
+)
+# 章节编号可能的首字符（阿拉伯数字另用str.isdecimal判断，与正则中的\d一致）
+_SECTION_FIRST_CHARS = frozenset('第一二三四五六七八九十')
+
+# 清理关键词时去掉的首尾字符：所有空白字符（与str.strip()一致）和引号
+_KEYWORD_STRIP_CHARS = ''.join(
+    ch for ch in map(chr, range(0x3001)) if ch.isspace()
+) + '"\''
+
+# 句子结束标点（中英文句号、感叹号、问号）
+_SENTENCE_END_RE = re.compile(r'[。！？.!?]')
+
+# 工作进程中打开的PDF文档，由_init_pdf_worker设置
+_worker_pdf = None
+
+def _open_pdf(pdf_path: str):
+    """打开PDF文档，优先使用PyMuPDF，未安装时使用PyPDF2"""
+    if fitz is not None:
+        return fitz.open(pdf_path)
+    return PyPDF2.PdfReader(pdf_path)
+
+def _pdf_page_count(pdf) -> int:
+    """获取PDF文档的页数"""
+    if fitz is not None:
+        return pdf.page_count
+    return len(pdf.pages)
+
+def _pdf_page_text(pdf, page_index: int) -> str:
+    """提取PDF文档单页的文本"""
+    if fitz is not None:
+        return pdf[page_index].get_text("text")
+    return pdf.pages[page_index].extract_text()
+
+def _init_pdf_worker(pdf_path: str):
+    """工作进程初始化，每个进程只打开一次PDF文档"""
+    global _worker_pdf
+    _worker_pdf = _open_pdf(pdf_path)
+
+def _extract_pdf_page(page_index: int) -> str:
+    """在工作进程中提取单页文本"""
+    return _pdf_page_text(_worker_pdf, page_index)
+
+def _file_hash(file_path: str) -> str:
+    """分块计算文件内容的哈希，不必一次性读入整个文件"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _process_file(file_path: str):
+    """在工作进程中分析单个文档（每个进程使用自己的分析器和数据库连接）
+    Returns:
+        (文件路径, 结果列表, 错误信息) 元组，成功时错误信息为None
+    """
+    analyzer = DocumentAnalyzer()
+    analyzer.parallel_pages = False
+    try:
+        return file_path, analyzer.process_document(file_path), None
+    except Exception as e:
+        return file_path, [], str(e)
+    finally:
+        analyzer.db.close()
+
+# 分析结果表格的列标题
+RESULT_HEADERS = ['序号', '章节', '页码', '关键词', '内容']
+
+def iter_result_rows(results: Iterable[Dict[str, any]]):
+    """把分析结果逐条转换为与RESULT_HEADERS列顺序一致的数据行"""
+    for i, result in enumerate(results, 1):
+        yield (i, result.get('section', ''), result['page'], result['keyword'], result['text'])
+
+def write_rows_to_excel(rows: Iterable[Sequence], file_path: str,
+                        headers: Sequence[str] = RESULT_HEADERS, title: str = "结果"):
+    """以只写模式逐行写入Excel，不构建DataFrame，也不为每个单元格保存样式
+    Args:
+        rows: 数据行（与headers的列顺序一致）
+        file_path: 输出文件路径
+        headers: 列标题
+        title: 工作表名称
+    """
+    import openpyxl  # 只在导出时导入，加快程序启动
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(list(headers))
+    for row in rows:
+        ws.append(list(row))
+    wb.save(file_path)
 
 def export_to_excel(results: List[Dict[str, any]], keywords: Set[str], file_path: str):
     """导出结果到Excel，关键词加粗高亮显示"""
+    import openpyxl
+    from openpyxl.styles import Font, PatternFill
+
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "关键词提取结果"
@@ -23,27 +139,17 @@ def export_to_excel(results: List[Dict[str, any]], keywords: Set[str], file_path
     highlight_fill = PatternFill(fill_type="solid", fgColor="FFFF00")  # 黄色高亮
     bold_font = Font(bold=True, color="FF0000")  # 红色加粗
     normal_font = Font(bold=False, color="000000")
+    # 关键词只需转换一次小写，不必在每行、每个关键词上重复计算
+    lowered_keywords = [kw.lower() for kw in keywords]
     for idx, result in enumerate(results, 1):
         row = [idx, result['page'], result.get('section', ''), result['text'], result['keyword']]
         ws.append(row)
         # 处理内容列关键词高亮
         content_cell = ws.cell(row=idx+1, column=4)
-        content = result['text']
-        # 只对第一个关键词出现加样式（openpyxl不支持富文本，需拆分单元格内容）
-        for kw in sorted(keywords, key=len, reverse=True):
-            pos = content.lower().find(kw.lower())
-            if pos != -1:
-                before = content[:pos]
-                match = content[pos:pos+len(kw)]
-                after = content[pos+len(kw):]
-                # 只保留关键词，其他内容不变
-                content_cell.value = before + match + after
-                # 只对整格加样式（openpyxl单元格不支持部分加粗高亮，需拆分为多列或备注）
-                content_cell.font = normal_font
-                # 关键词单独列高亮
-                ws.cell(row=idx+1, column=5).font = bold_font
-                ws.cell(row=idx+1, column=5).fill = highlight_fill
-                break
+        lowered_content = result['text'].lower()
+        # openpyxl单元格不支持部分加粗高亮，内容中出现关键词时只对整格加样式
+        if any(kw in lowered_content for kw in lowered_keywords):
+            content_cell.font = normal_font
         # 关键词列高亮
         ws.cell(row=idx+1, column=5).font = bold_font
         ws.cell(row=idx+1, column=5).fill = highlight_fill
@@ -57,30 +163,123 @@ class DocumentAnalyzer:
         """
         self.logger = logging.getLogger(__name__)
         self.db = DatabaseManager()
+        # 是否用多进程提取大PDF的页面；已经按文件并行处理时关闭，避免进程过多
+        self.parallel_pages = True
+        self._automaton = None
+        self._keyword_pattern = None
         self._refresh_keywords()
-    
+
     def _refresh_keywords(self):
         """刷新关键词列表"""
         self.keywords = {kw["keyword"] for kw in self.db.get_all_keywords()}
+        # 关键词的小写形式只在关键词变化时计算一次；按关键词排序，
+        # 使仅大小写不同的关键词总以固定顺序输出
+        self._keywords_lower = [(kw.lower(), kw) for kw in sorted(self.keywords)]
+        # 关键词都不含大小写字母（如纯中文）时，无需再复制一份小写的页面内容
+        self._keywords_caseless = all(kw.lower() == kw == kw.upper() for kw in self.keywords)
+        # 关键词发生变化，已构建的自动机和正则失效，下次扫描时重新构建
+        self._automaton = None
+        self._keyword_pattern = None
+
+    def _get_automaton(self):
+        """获取（必要时构建）关键词的Aho-Corasick自动机"""
+        if self._automaton is None:
+            automaton = ahocorasick.Automaton()
+            # 仅大小写不同的关键词共用同一个小写键，全部保留下来
+            by_lower = {}
+            for keyword_lower, keyword in self._keywords_lower:
+                by_lower.setdefault(keyword_lower, []).append(keyword)
+            for keyword_lower, keywords in by_lower.items():
+                automaton.add_word(keyword_lower, (len(keyword_lower), keywords))
+            automaton.make_automaton()
+            self._automaton = automaton
+        return self._automaton
+
+    def _get_keyword_pattern(self):
+        """获取（必要时构建）未安装pyahocorasick时使用的关键词正则
+
+        Returns:
+            (正则, 小写关键词到原关键词的映射, 小写关键词到其前缀关键词的映射) 元组
+        """
+        if self._keyword_pattern is None:
+            by_lower = {}
+            for keyword_lower, keyword in self._keywords_lower:
+                by_lower.setdefault(keyword_lower, []).append(keyword)
+            # 长关键词在前；用前瞻断言匹配，同一文本可在每个位置重新开始匹配
+            alternation = '|'.join(
+                re.escape(kw) for kw in sorted(by_lower, key=len, reverse=True)
+            )
+            pattern = re.compile(f'(?=({alternation}))')
+            # 同一位置只能匹配到最长的关键词，是它前缀的较短关键词必然也在此出现（由长到短）
+            prefixes = {
+                kw: [kw[:i] for i in range(len(kw) - 1, 0, -1) if kw[:i] in by_lower]
+                for kw in by_lower
+            }
+            self._keyword_pattern = (pattern, by_lower, prefixes)
+        return self._keyword_pattern
+
+    def _iter_keyword_matches(self, lowered_content: str):
+        """按出现位置遍历内容中的关键词
+
+        两种实现的输出顺序相同：按起始位置排列，同一位置的长关键词在前，
+        这样find_relevant_paragraphs去重时同一句子总记在同一个关键词上。
+        Yields:
+            (起始位置, 关键词) 元组
+        """
+        if ahocorasick is not None:
+            if not self.keywords:
+                return
+            # 自动机按结束位置输出命中，改为按起始位置排序
+            hits = sorted(
+                (end_idx - length + 1, -length, keywords)
+                for end_idx, (length, keywords) in self._get_automaton().iter(lowered_content)
+            )
+            for start_idx, _, keywords in hits:
+                for keyword in keywords:
+                    yield start_idx, keyword
+            return
+        # 未安装pyahocorasick时用单个编译好的正则一次扫描
+        if not self.keywords:
+            return
+        pattern, by_lower, prefixes = self._get_keyword_pattern()
+        for match in pattern.finditer(lowered_content):
+            matched = match.group(1)
+            start_idx = match.start()
+            for keyword_lower in (matched, *prefixes[matched]):
+                for keyword in by_lower[keyword_lower]:
+                    yield start_idx, keyword
     
     def clean_keyword(self, keyword: str) -> str:
         """清理关键词，去除引号和多余的空格"""
-        return keyword.strip().strip('"').strip("'").strip()
+        return keyword.strip(_KEYWORD_STRIP_CHARS)
 
     def add_keywords(self, keywords: List[str]) -> None:
-        """添加关键词到数据库中"""
+        """添加关键词到数据库中（批量写入，只提交一次）"""
+        cleaned_keywords = []
         for keyword in keywords:
             cleaned_keyword = self.clean_keyword(keyword)
             if cleaned_keyword:
-                self.db.add_keyword(cleaned_keyword)
+                cleaned_keywords.append(cleaned_keyword)
+        if cleaned_keywords:
+            self.db.add_keywords_bulk(cleaned_keywords)
         self._refresh_keywords()
 
     def remove_keywords(self, keywords: List[str]) -> None:
-        """从数据库中删除关键词"""
+        """从数据库中删除关键词（批量删除，只提交一次）"""
+        cleaned_keywords = []
         for keyword in keywords:
             cleaned_keyword = self.clean_keyword(keyword)
             if cleaned_keyword:
-                self.db.delete_keyword(cleaned_keyword)
+                cleaned_keywords.append(cleaned_keyword)
+        if cleaned_keywords:
+            self.db.delete_keywords_bulk(cleaned_keywords)
+        self._refresh_keywords()
+
+    def clear_keywords(self) -> None:
+        """删除所有关键词"""
+        if not self.keywords:
+            return
+        self.db.delete_all_keywords()
         self._refresh_keywords()
 
     def get_keywords(self) -> Set[str]:
@@ -93,19 +292,32 @@ class DocumentAnalyzer:
             包含页码和文本内容的字典列表
         """
         pages_content = []
-        # 打开PDF文件
-        with open(pdf_path, 'rb') as file:
-            # 创建PDF阅读器
-            pdf_reader = PyPDF2.PdfReader(file)
-            # 遍历每一页
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                # 提取文本并添加到列表中
-                text = page.extract_text()
-                if text.strip():
-                    pages_content.append({
-                        'page': page_num,
-                        'content': text
-                    })
+        # 优先使用PyMuPDF，未安装时回退到PyPDF2（纯Python实现，多进程收益更明显）
+        pdf = _open_pdf(pdf_path)
+        try:
+            page_count = _pdf_page_count(pdf)
+            parallel = self.parallel_pages and page_count >= PARALLEL_PDF_MIN_PAGES
+            if not parallel:
+                texts = [_pdf_page_text(pdf, i) for i in range(page_count)]
+        finally:
+            if fitz is not None:
+                pdf.close()
+        if parallel:
+            # 各页文本提取互不依赖，分发到多个进程并按页序收集结果
+            # 每个进程都要打开一次文档，进程数不超过任务批数
+            task_count = -(-page_count // PDF_PAGES_PER_TASK)
+            max_workers = min(os.cpu_count() or 1, task_count)
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_pdf_worker,
+                                     initargs=(pdf_path,)) as executor:
+                texts = list(executor.map(_extract_pdf_page, range(page_count),
+                                          chunksize=PDF_PAGES_PER_TASK))
+        for page_num, text in enumerate(texts, 1):
+            if text.strip():
+                pages_content.append({
+                    'page': page_num,
+                    'content': text
+                })
         return pages_content
 
     def extract_text_from_docx(self, docx_path: str) -> List[Dict[str, any]]:
@@ -113,24 +325,28 @@ class DocumentAnalyzer:
         Returns:
             包含段落位置和文本内容的字典列表
         """
+        from docx import Document  # 只在处理DOCX时导入，加快程序启动
+
         # 打开DOCX文件
         doc = Document(docx_path)
         paragraphs_content = []
         current_position = 1
         
         # 提取正文段落
+        # paragraph.text和cell.text每次访问都要重新拼接所有run，只读取一次
         for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
+            text = paragraph.text.strip()
+            if text:
                 paragraphs_content.append({
                     'page': current_position,
-                    'content': paragraph.text.strip()
+                    'content': text
                 })
                 current_position += 1
         
         # 提取表格中的文本
         for table in doc.tables:
             for row in table.rows:
-                row_text = ' '.join(cell.text.strip() for cell in row.cells if cell.text.strip())
+                row_text = ' '.join(filter(None, (cell.text.strip() for cell in row.cells)))
                 if row_text:
                     paragraphs_content.append({
                         'page': current_position,
@@ -148,231 +364,99 @@ class DocumentAnalyzer:
         Returns:
             章节编号，如果没有则返回空字符串。
         """
-        import re
-        patterns = [
-            r'^第[一二三四五六七八九十百零]+章',  # 中文数字章节
-            r'^第\d+章',                      # 阿拉伯数字章节
-            r'^\d+\.\d+(\.\d+)?',            # 数字编号（如1.2, 1.2.3）
-            r'^[一二三四五六七八九十]+、',      # 中文数字编号
-            r'^\d+、'                         # 阿拉伯数字编号
-        ]
-        for pattern in patterns:
-            m = re.match(pattern, text)
-            if m:
-                return m.group(0)
-        return ""
+        # 绝大多数句子不以章节编号开头，先看首字符，避免无谓的正则匹配
+        if not text or not (text[0] in _SECTION_FIRST_CHARS or text[0].isdecimal()):
+            return ""
+        m = _SECTION_RE.match(text)
+        return m.group(0) if m else ""
 
     def find_relevant_paragraphs(self, pages_content: List[Dict[str, any]]) -> List[Dict[str, any]]:
         """
         查找包含关键词的相关句子（前后两个句号之间），并高亮该句子。
         优化为真正提取前后两个句号之间的内容。
         """
-        import re
         results = []
+        # 已添加的（页码, 句子），用于O(1)去重
+        seen = set()
         current_section = ""
-        # 支持中英文句号
-        sentence_end = r'[。！？.!?]'
         for page_data in pages_content:
             page_num = page_data['page']
             content = page_data['content']
             # 先查找所有关键词在全文的位置
-            lowered_content = content.lower()
-            for keyword in self.keywords:
-                keyword_lower = keyword.lower()
-                start = 0
-                while True:
-                    idx = lowered_content.find(keyword_lower, start)
-                    if idx == -1:
-                        break
-                    # 向前找最近的句号
-                    pre = content.rfind('。', 0, idx)
-                    for p in ['。', '！', '？', '.', '!', '?']:
-                        p_idx = content.rfind(p, 0, idx)
-                        if p_idx > pre:
-                            pre = p_idx
-                    # 向后找下一个句号
-                    post = len(content)
-                    for p in ['。', '！', '？', '.', '!', '?']:
-                        p_idx = content.find(p, idx + len(keyword))
-                        if p_idx != -1 and p_idx < post:
-                            post = p_idx
-                    # 取出完整句子
-                    sent = content[pre+1:post+1].strip()
-                    # 提取章节号
-                    section = self.extract_section_number(sent)
-                    if section:
-                        current_section = section
-                    # 避免重复添加同一句
-                    already = False
-                    for r in results:
-                        if r['page'] == page_num and r['text'] == sent:
-                            already = True
-                            break
-                    if not already and sent:
-                        results.append({
-                            'page': page_num,
-                            'section': current_section,
-                            'text': sent,
-                            'keyword': keyword,
-                            'original_length': len(sent)
-                        })
-                    start = idx + len(keyword)
+            lowered_content = content if self._keywords_caseless else content.lower()
+            # 本页所有句号的位置，在第一次命中关键词时计算一次
+            ends = None
+            for idx, keyword in self._iter_keyword_matches(lowered_content):
+                if ends is None:
+                    ends = [m.start() for m in _SENTENCE_END_RE.finditer(content)]
+                # 向前找最近的句号（没有则为-1，即从页首开始）
+                pos = bisect.bisect_left(ends, idx)
+                pre = ends[pos - 1] if pos > 0 else -1
+                # 向后找下一个句号（没有则到页尾）
+                pos = bisect.bisect_left(ends, idx + len(keyword), pos)
+                post = ends[pos] if pos < len(ends) else len(content)
+                # 取出完整句子
+                sent = content[pre+1:post+1].strip()
+                # 提取章节号
+                section = self.extract_section_number(sent)
+                if section:
+                    current_section = section
+                # 避免重复添加同一句
+                key = (page_num, sent)
+                if sent and key not in seen:
+                    seen.add(key)
+                    results.append({
+                        'page': page_num,
+                        'section': current_section,
+                        'text': sent,
+                        'keyword': keyword,
+                        'original_length': len(sent)
+                    })
         return results
 
     def process_document(self, file_path: str) -> List[Dict[str, any]]:
-        """处理文档并返回结果"""
+        """处理文档并返回结果（同一文件的文本和同一组关键词的结果会被缓存）"""
         # 判断文件格式
+        extract: Callable[[str], List[Dict]]
         if file_path.lower().endswith('.pdf'):
-            # 如果是PDF文件，提取文本
-            pages_content = self.extract_text_from_pdf(file_path)
+            extract = self.extract_text_from_pdf
         elif file_path.lower().endswith('.docx'):
-            # 如果是DOCX文件，提取文本
-            pages_content = self.extract_text_from_docx(file_path)
+            extract = self.extract_text_from_docx
         else:
             # 如果不是支持的文件格式，抛出异常
             raise ValueError("不支持的文件格式，仅支持PDF和DOCX格式")
         
-        # 返回结果
-        return self.find_relevant_paragraphs(pages_content)
-def main():
-    parser = argparse.ArgumentParser(description='文档关键词段落提取工具')
-    parser.add_argument('file', nargs='?', help='要处理的文档路径（PDF或DOCX格式）')
-    parser.add_argument('--add-keywords', nargs='+', help='添加新的关键词')
-    parser.add_argument('--remove-keywords', nargs='+', help='删除指定的关键词')
-    parser.add_argument('--remove-all', action='store_true', help='删除所有关键词')
-    parser.add_argument('--list-keywords', action='store_true', help='列出所有当前的关键词')
-    parser.add_argument('--keywords-file', default='keywords.json', help='指定关键词配置文件路径')
-    parser.add_argument('--export-excel', type=str, help='导出结果到Excel文件')
-    args = parser.parse_args()
-    analyzer = DocumentAnalyzer(keywords_file=args.keywords_file)
-    # 处理关键词相关的命令
-    if args.list_keywords:
-        print("\n当前的关键词列表：")
-        for keyword in sorted(analyzer.keywords):
-            print(f"- {keyword}")
-        return
-    if args.add_keywords:
-        cleaned_keywords = [analyzer.clean_keyword(k) for k in args.add_keywords]
-        analyzer.add_keywords(args.add_keywords)
-        print(f"\n已添加关键词: {', '.join(cleaned_keywords)}")
-    if args.remove_all:
-        # 保存关键词数量用于显示
-        removed_count = len(analyzer.keywords)
-        # 清空所有关键词
-        analyzer.keywords.clear()
-        analyzer.save_keywords([])
-        print(f"\n已删除所有关键词（共 {removed_count} 个）")
-    elif args.remove_keywords:
-        cleaned_keywords = [analyzer.clean_keyword(k) for k in args.remove_keywords]
-        analyzer.remove_keywords(args.remove_keywords)
-        print(f"\n已删除关键词: {', '.join(cleaned_keywords)}")
-    # 如果没有提供文件参数且没有其他操作，显示帮助信息
-    if not any([args.file, args.add_keywords, args.remove_keywords, args.list_keywords, args.export_excel]):
-        parser.print_help()
-        return
-    # 处理文档
-    if args.file:
-        if not os.path.exists(args.file):
-            print(f"\n错误：找不到文件 {args.file}")
-            return
-        if not analyzer.keywords:
-            print("\n错误：未设置任何关键词。请先使用 --add-keywords 添加关键词。")
-            return
-        try:
-            results = analyzer.process_document(args.file)
-            print_checklist(results, analyzer.keywords)
-            if args.export_excel:
-                export_to_excel(results, analyzer.keywords, args.export_excel)
-                print(f"\n结果已导出到: {args.export_excel}")
-        except Exception as e:
-            print(f"\n处理文档时出错: {str(e)}")
-        # 匹配常见的章节编号格式
-        import re
-        patterns = [
-            r'^第[一二三四五六七八九十百零]+章',  # 中文数字章节
-            r'^第\d+章',                      # 阿拉伯数字章节
-            r'^\d+\.\d+(\.\d+)?',            # 数字编号（如1.2, 1.2.3）
-            r'^[一二三四五六七八九十]+、',      # 中文数字编号
-            r'^\d+、'                         # 阿拉伯数字编号
-        ]
+        # 文件内容和关键词都没有变化时直接返回上次的结果，跳过文本提取
+        file_hash = _file_hash(file_path)
+        keywords_hash = hashlib.blake2b(
+            '\0'.join(sorted(self.keywords)).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        results = self.db.get_cached_results(file_hash, keywords_hash)
+        if results is not None:
+            self.logger.info("使用缓存的分析结果: %s", file_path)
+            return results
         
-        for pattern in patterns:
-            match = re.match(pattern, text)
-            if match:
-                return match.group(0)
-        return ""
-
-    def find_relevant_paragraphs(self, pages_content: List[Dict[str, any]]) -> List[Dict[str, any]]:
-        """查找包含关键词的相关句子（前后两个句号之间），并高亮该句子。优化为真正提取前后两个句号之间的内容。"""
-        import re
-        results = []
-        current_section = ""
-        # 支持中英文句号
-        sentence_end = r'[。！？.!?]'
-        for page_data in pages_content:
-            page_num = page_data['page']
-            content = page_data['content']
-            # 先查找所有关键词在全文的位置
-            lowered_content = content.lower()
-            for keyword in self.keywords:
-                keyword_lower = keyword.lower()
-                start = 0
-                while True:
-                    idx = lowered_content.find(keyword_lower, start)
-                    if idx == -1:
-                        break
-                    # 向前找最近的句号
-                    pre = content.rfind('。', 0, idx)
-                    for p in ['。', '！', '？', '.', '!', '?']:
-                        p_idx = content.rfind(p, 0, idx)
-                        if p_idx > pre:
-                            pre = p_idx
-                    # 向后找下一个句号
-                    post = len(content)
-                    for p in ['。', '！', '？', '.', '!', '?']:
-                        p_idx = content.find(p, idx + len(keyword))
-                        if p_idx != -1 and p_idx < post:
-                            post = p_idx
-                    # 取出完整句子
-                    sent = content[pre+1:post+1].strip()
-                    # 提取章节号
-                    section = self.extract_section_number(sent)
-                    if section:
-                        current_section = section
-                    # 避免重复添加同一句
-                    already = False
-                    for r in results:
-                        if r['page'] == page_num and r['text'] == sent:
-                            already = True
-                            break
-                    if not already and sent:
-                        results.append({
-                            'page': page_num,
-                            'section': current_section,
-                            'text': sent,
-                            'keyword': keyword,
-                            'original_length': len(sent)
-                        })
-                    start = idx + len(keyword)
+        # 关键词变化时复用已提取的文本，只重新匹配关键词
+        pages_content = self.db.get_cached_text(file_hash)
+        if pages_content is None:
+            pages_content = extract(file_path)
+            self.db.save_cached_text(file_hash, pages_content)
+        results = self.find_relevant_paragraphs(pages_content)
+        self.db.save_cached_results(file_hash, keywords_hash, results)
+        # 返回结果
         return results
 
-    def process_document(self, file_path: str) -> List[Dict[str, any]]:
-        """处理文档并返回结果"""
-        # 判断文件格式
-        if file_path.lower().endswith('.pdf'):
-            # 如果是PDF文件，提取文本
-            pages_content = self.extract_text_from_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            # 如果是DOCX文件，提取文本
-            pages_content = self.extract_text_from_docx(file_path)
-        else:
-            # 如果不是支持的文件格式，抛出异常
-            raise ValueError("不支持的文件格式，仅支持PDF和DOCX格式")
-        
-        # 返回结果
-        return self.find_relevant_paragraphs(pages_content)
+@lru_cache(maxsize=8)
+def _highlight_pattern(keywords: frozenset):
+    """所有关键词合成一个忽略大小写的正则（长关键词优先），同一组关键词只编译一次"""
+    return re.compile(
+        '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))),
+        re.IGNORECASE
+    )
 
-def highlight_keywords(text: str, keywords: Set[str], color: str = '\033[93m', bold: bool = True) -> str:
+def highlight_keywords(
+    text: str, keywords: AbstractSet[str], color: str = '\033[93m', bold: bool = True
+) -> str:
     """高亮并加粗显示文本中的关键词所在句子
     Args:
         text: 要处理的句子
@@ -385,18 +469,11 @@ def highlight_keywords(text: str, keywords: Set[str], color: str = '\033[93m', b
     reset_color = '\033[0m'
     bold_code = '\033[1m' if bold else ''
     result = text
-    for keyword in sorted(keywords, key=len, reverse=True):
-        pattern = keyword.lower()
-        index = result.lower().find(pattern)
-        while index != -1:
-            original_keyword = result[index:index + len(keyword)]
-            result = (
-                result[:index] +
-                f"{bold_code}{color}{original_keyword}{reset_color}" +
-                result[index + len(keyword):]
-            )
-            next_start = index + len(keyword) + len(color) + len(reset_color) + (len(bold_code) if bold else 0)
-            index = result.lower().find(pattern, next_start)
+    if keywords:
+        frozen = keywords if isinstance(keywords, frozenset) else frozenset(keywords)
+        # 用模板字符串替换，由正则引擎直接展开，不必每个匹配回调一次Python函数
+        template = (bold_code + color).replace('\\', '\\\\') + r'\g<0>' + reset_color
+        result = _highlight_pattern(frozen).sub(template, text)
     # 整句加粗
     if bold:
         result = f"{bold_code}{result}{reset_color}"
@@ -422,9 +499,12 @@ def print_checklist(results: List[Dict[str, any]], keywords: Set[str]):
     print(f"\n{bold}找到 {len(results)} 个匹配段落：{reset}")
     print(f"{cyan}{'-' * 65}{reset}")
     
+    # 只转换一次，每个段落都复用同一个缓存的高亮正则
+    frozen = frozenset(keywords)
+    
     for i, result in enumerate(results, 1):
         # 高亮显示段落中的所有关键词
-        highlighted_text = highlight_keywords(result['text'], keywords)
+        highlighted_text = highlight_keywords(result['text'], frozen)
         
         # 构建位置信息
         location = f"第{result['page']}页"
@@ -452,9 +532,13 @@ def main():
     parser.add_argument('--remove-all', action='store_true', help='删除所有关键词')
     parser.add_argument('--list-keywords', action='store_true', help='列出所有当前的关键词')
     parser.add_argument('--keywords-file', default='keywords.json', help='指定关键词配置文件路径')
-    parser.add_argument('--export-excel', type=str, help='导出结果到Excel文件')
+    parser.add_argument('--export-excel', type=str, help='导出结果到Excel文件（仅处理单个文件时）')
+    parser.add_argument('--dir', help='批量处理目录下的所有PDF和DOCX文档')
+    parser.add_argument('--workers', type=int, help='批量处理时的进程数（默认为CPU核数）')
     
     args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers 必须是正整数')
     
     analyzer = DocumentAnalyzer(keywords_file=args.keywords_file)
     
@@ -474,8 +558,7 @@ def main():
         # 保存关键词数量用于显示
         removed_count = len(analyzer.keywords)
         # 清空所有关键词
-        analyzer.keywords.clear()
-        analyzer.save_keywords([])
+        analyzer.clear_keywords()
         print(f"\n已删除所有关键词（共 {removed_count} 个）")
     elif args.remove_keywords:
         cleaned_keywords = [analyzer.clean_keyword(k) for k in args.remove_keywords]
@@ -483,10 +566,32 @@ def main():
         print(f"\n已删除关键词: {', '.join(cleaned_keywords)}")
     
     # 如果没有提供文件参数且没有其他操作，显示帮助信息
-    if not any([args.file, args.add_keywords, args.remove_keywords, args.list_keywords]):
+    if not any([args.file, args.dir, args.add_keywords, args.remove_keywords, args.list_keywords]):
         parser.print_help()
         return
     
+    # 批量处理目录，每个文档交给一个工作进程
+    if args.dir:
+        if not os.path.isdir(args.dir):
+            print(f"\n错误：找不到目录 {args.dir}")
+            return
+        if not analyzer.keywords:
+            print("\n错误：未设置任何关键词。请先使用 --add-keywords 添加关键词。")
+            return
+        directory = Path(args.dir)
+        paths = sorted(str(p) for p in (*directory.glob('*.pdf'), *directory.glob('*.docx')))
+        if not paths:
+            print(f"\n目录 {args.dir} 中没有PDF或DOCX文档")
+            return
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for file_path, results, error in executor.map(_process_file, paths):
+                print(f"\n===== {file_path} =====")
+                if error:
+                    print(f"\n处理文档时出错: {error}")
+                else:
+                    print_checklist(results, analyzer.keywords)
+        return
+    
     # 处理文档
     if args.file:
         if not os.path.exists(args.file):
@@ -508,4 +613,5 @@ def main():
             print(f"\n处理文档时出错: {str(e)}")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
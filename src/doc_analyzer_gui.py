@@ -30,43 +30,69 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import bisect
+import codecs
 import json
+import mmap
 import os
-import pandas as pd
-from doc_analyzer import DocumentAnalyzer
+import queue
+import re
+import threading
+from doc_analyzer import DocumentAnalyzer, iter_result_rows, write_rows_to_excel
 import sys
 import logging
+import multiprocessing
 from datetime import datetime
-import traceback
 
 # 版本信息
 __version__ = '1.0.0'
 __author__ = 'cofecatrj'
 __date__ = '2025-07-20'
 
+# 结果表格每批插入的行数，每批拼成一段Tcl脚本一次执行
+RESULT_INSERT_CHUNK = 2000
+
+# Tcl脚本中有特殊含义、需要反斜杠转义的字符
+_TCL_SPECIAL = re.compile(r'[\\{}\[\]$";\s\x00]')
+_TCL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\v': '\\v', '\f': '\\f', '\x00': '\\x00'}
+
+# 关键词文件的分隔符：换行、中英文逗号、中英文分号、制表符
+_KEYWORD_SEP = re.compile(r'[\n,，;；\t]+')
+# 读取关键词文件时每次解码的字节数
+_KEYWORD_FILE_CHUNK = 1 << 20
+
+def _tcl_quote(value) -> str:
+    """将值转义为Tcl脚本中的单个单词"""
+    text = str(value)
+    if not text:
+        return '{}'
+    return _TCL_SPECIAL.sub(
+        lambda m: _TCL_ESCAPES.get(m.group(0), '\\' + m.group(0)), text
+    )
+
 # 配置日志记录
+# 日志文件路径（按日期命名），只在导入时计算一次
+LOG_DIR = 'logs'
+LOG_PATH = os.path.join(LOG_DIR, f'tender_analyzer_{datetime.now():%Y%m%d}.log')
+
 def setup_logger():
     # 创建logs目录（如果不存在）
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-        
-    # 设置日志文件名（使用当前日期）
-    log_file = os.path.join('logs', f'tender_analyzer_{datetime.now().strftime("%Y%m%d")}.log')
-    
+    os.makedirs(LOG_DIR, exist_ok=True)
+
     # 配置日志格式
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s [%(levelname)s] %(message)s',
         handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.FileHandler(LOG_PATH, encoding='utf-8'),
             logging.StreamHandler()
         ]
     )
     
-    return logging.getLogger(__name__)
+    return logger
 
-# 创建logger实例
-logger = setup_logger()
+# 创建logger实例，日志处理器在main()中解析完命令行参数后再配置
+logger = logging.getLogger(__name__)
 
 class TenderAnalyzerGUI:
     def __init__(self):
@@ -74,8 +100,15 @@ class TenderAnalyzerGUI:
         self.root.title(f'招标文件分析器 v{__version__}')
         self.root.geometry('1200x800')
         
-        logger.info(f"启动招标文件分析器 v{__version__}")
+        logger.info("启动招标文件分析器 v%s", __version__)
         
+        # 正在进行的结果表格分批插入任务
+        self._populate_job = None
+        # 最近一次分析的结果，导出时直接使用，避免逐行读取Treeview
+        self._last_results = None
+        # 已排序的关键词列表，随增删操作增量维护，避免每次刷新都重新排序
+        self._sorted_keywords = None
+
         try:
             self.analyzer = DocumentAnalyzer()
             
@@ -91,8 +124,7 @@ class TenderAnalyzerGUI:
             self.show_version_info()
             
         except Exception as e:
-            logger.error(f"初始化失败: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("初始化失败: %s", e)
             messagebox.showerror("错误", f"程序初始化失败：{str(e)}")
 
     def show_version_info(self):
@@ -132,8 +164,8 @@ class TenderAnalyzerGUI:
         keyword_entry = ttk.Entry(keyword_frame, textvariable=self.keyword_var)
         keyword_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=5)
         
-        add_btn = ttk.Button(keyword_frame, text="添加关键词", command=self.add_keyword)
-        add_btn.grid(row=0, column=1, padx=5)
+        self.add_btn = ttk.Button(keyword_frame, text="添加关键词", command=self.add_keyword)
+        self.add_btn.grid(row=0, column=1, padx=5)
 
         # 关键词列表
         self.keyword_list = tk.Listbox(left_frame, selectmode=tk.EXTENDED)
@@ -150,14 +182,14 @@ class TenderAnalyzerGUI:
         btn_frame = ttk.Frame(left_frame)
         btn_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E))
         
-        remove_btn = ttk.Button(btn_frame, text="删除选中", command=self.remove_keywords)
-        remove_btn.pack(side=tk.LEFT, padx=5)
+        self.remove_btn = ttk.Button(btn_frame, text="删除选中", command=self.remove_keywords)
+        self.remove_btn.pack(side=tk.LEFT, padx=5)
         
-        clear_btn = ttk.Button(btn_frame, text="清空所有", command=self.clear_keywords)
-        clear_btn.pack(side=tk.LEFT, padx=5)
+        self.clear_btn = ttk.Button(btn_frame, text="清空所有", command=self.clear_keywords)
+        self.clear_btn.pack(side=tk.LEFT, padx=5)
 
-        import_btn = ttk.Button(btn_frame, text="导入关键词", command=self.import_keywords)
-        import_btn.pack(side=tk.LEFT, padx=5)
+        self.import_btn = ttk.Button(btn_frame, text="导入关键词", command=self.import_keywords)
+        self.import_btn.pack(side=tk.LEFT, padx=5)
 
         # 右侧面板 - 文档处理
         right_frame = ttk.LabelFrame(main_frame, text="招标文件处理", padding="5")
@@ -178,8 +210,13 @@ class TenderAnalyzerGUI:
         browse_btn = ttk.Button(file_frame, text="浏览文件", command=self.browse_file)
         browse_btn.grid(row=0, column=1, padx=5)
         
-        analyze_btn = ttk.Button(file_frame, text="分析文档", command=self.analyze_document)
-        analyze_btn.grid(row=0, column=2, padx=5)
+        self.analyze_btn = ttk.Button(file_frame, text="分析文档", command=self.analyze_document)
+        self.analyze_btn.grid(row=0, column=2, padx=5)
+
+        # 导入关键词和分析文档在后台线程中读写同一组关键词，执行期间禁用所有会修改关键词的按钮
+        self.keyword_task_widgets = (
+            self.add_btn, self.remove_btn, self.clear_btn, self.import_btn, self.analyze_btn
+        )
 
         # 结果显示表格
         self.result_tree = ttk.Treeview(right_frame, columns=('no', 'section', 'page', 'keyword', 'content'),
@@ -206,33 +243,80 @@ class TenderAnalyzerGUI:
         self.result_tree.configure(yscrollcommand=scrollbar.set)
 
         # 导出按钮
-        export_btn = ttk.Button(right_frame, text="导出结果", command=self.export_results)
-        export_btn.grid(row=2, column=0, sticky=tk.E, padx=5, pady=5)
+        self.export_btn = ttk.Button(right_frame, text="导出结果", command=self.export_results)
+        self.export_btn.grid(row=2, column=0, sticky=tk.E, padx=5, pady=5)
         
         logger.debug("GUI界面设置完成")
 
     def update_status(self, message):
         """更新状态栏信息"""
-        logger.debug(f"状态更新: {message}")
+        logger.debug("状态更新: %s", message)
         self.status_label.config(text=message)
         self.root.update()
 
+    def run_in_background(self, task, on_done, on_error, widgets=()):
+        """在后台线程中执行耗时任务，通过队列把结果交回Tk主线程
+
+        Args:
+            task: 在后台线程中执行的无参函数
+            on_done: 任务成功后在主线程中调用，参数为任务返回值
+            on_error: 任务失败后在主线程中调用，参数为异常对象
+            widgets: 任务执行期间需要禁用的按钮
+        """
+        result_queue = queue.Queue()
+
+        def worker():
+            try:
+                result_queue.put((True, task()))
+            except Exception as e:
+                logger.exception("后台任务执行失败")
+                result_queue.put((False, e))
+
+        for widget in widgets:
+            widget.state(['disabled'])
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, self._drain_results, result_queue, on_done, on_error, widgets)
+
+    def _drain_results(self, result_queue, on_done, on_error, widgets):
+        """轮询后台任务结果，未完成时继续等待"""
+        try:
+            success, value = result_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._drain_results, result_queue, on_done, on_error, widgets)
+            return
+
+        for widget in widgets:
+            widget.state(['!disabled'])
+        if success:
+            on_done(value)
+        else:
+            on_error(value)
+
     def update_keyword_list(self):
         """更新关键词列表显示"""
+        if self._sorted_keywords is None:
+            self._sorted_keywords = sorted(self.analyzer.keywords)
+        keywords = self._sorted_keywords
         self.keyword_list.delete(0, tk.END)
-        keywords = sorted(self.analyzer.keywords)
-        for keyword in keywords:
-            self.keyword_list.insert(tk.END, keyword)
+        if keywords:
+            # 一次调用批量插入所有关键词
+            self.keyword_list.insert(tk.END, *keywords)
         self.update_status(f"当前共有 {len(keywords)} 个关键词")
-        logger.debug(f"更新关键词列表，共 {len(keywords)} 个")
+        logger.debug("更新关键词列表，共 %s 个", len(keywords))
 
     def add_keyword(self):
         """添加关键词"""
         keyword = self.keyword_var.get().strip()
         if keyword:
-            logger.info(f"添加关键词: {keyword}")
+            logger.info("添加关键词: %s", keyword)
             self.analyzer.add_keywords([keyword])
             self.keyword_var.set('')
+            cleaned_keyword = self.analyzer.clean_keyword(keyword)
+            if self._sorted_keywords is not None and cleaned_keyword in self.analyzer.keywords:
+                sorted_keywords = self._sorted_keywords
+                index = bisect.bisect_left(sorted_keywords, cleaned_keyword)
+                if index == len(sorted_keywords) or sorted_keywords[index] != cleaned_keyword:
+                    sorted_keywords.insert(index, cleaned_keyword)
             self.update_keyword_list()
             self.update_status(f"已添加关键词: {keyword}")
 
@@ -241,31 +325,39 @@ class TenderAnalyzerGUI:
         selected = self.keyword_list.curselection()
         if selected:
             keywords = [self.keyword_list.get(i) for i in selected]
-            logger.info(f"删除关键词: {', '.join(keywords)}")
+            logger.info("删除关键词: %s", ', '.join(keywords))
             self.analyzer.remove_keywords(keywords)
+            sorted_keywords = self._sorted_keywords
+            if sorted_keywords is not None:
+                for keyword in keywords:
+                    index = bisect.bisect_left(sorted_keywords, keyword)
+                    if index < len(sorted_keywords) and sorted_keywords[index] == keyword:
+                        sorted_keywords.pop(index)
             self.update_keyword_list()
             self.update_status(f"已删除 {len(keywords)} 个关键词")
 
     @staticmethod
     def process_keywords_file(file_path):
-        """处理关键词文件，支持逗号和换行符分隔"""
+        """处理关键词文件，支持中英文逗号、分号、制表符和换行符分隔"""
         keywords = set()  # 使用集合去重
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                
-            # 首先按换行符分割
-            lines = content.split('\n')
-            for line in lines:
-                # 对每一行按逗号分割
-                if line.strip():
-                    words = line.split('，')  # 使用中文逗号分割
-                    # 处理每个关键词
-                    for word in words:
-                        word = word.strip()
-                        if word:
-                            keywords.add(word)
-            
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                # 内存映射文件并分块增量解码，不在内存中保留整个文件内容
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+                    tail = ''
+                    for offset in range(0, len(mm), _KEYWORD_FILE_CHUNK):
+                        chunk = mm[offset:offset + _KEYWORD_FILE_CHUNK]
+                        words = _KEYWORD_SEP.split(tail + decoder.decode(chunk))
+                        # 最后一段可能在分块边界被截断，留到下一块继续处理
+                        tail = words.pop()
+                        keywords.update(word for word in map(str.strip, words) if word)
+                    tail = (tail + decoder.decode(b'', final=True)).strip()
+                    if tail:
+                        keywords.add(tail)
+
             return list(keywords)
         except Exception as e:
             raise Exception(f"处理关键词文件失败: {str(e)}")
@@ -279,39 +371,47 @@ class TenderAnalyzerGUI:
         if not file_path:
             return
 
-        try:
-            logger.info(f"开始从文件导入关键词: {file_path}")
-            self.update_status("正在导入关键词...")
-            
+        logger.info("开始从文件导入关键词: %s", file_path)
+        self.update_status("正在导入关键词...")
+
+        def task():
             # 处理关键词文件
             keywords = self.process_keywords_file(file_path)
-            
+            # 添加关键词
+            if keywords:
+                self.analyzer.add_keywords(keywords)
+            return keywords
+
+        def on_done(keywords):
             if not keywords:
+                self.update_status("就绪")
                 messagebox.showwarning('警告', '文件中没有找到有效的关键词！')
                 return
-            
-            # 添加关键词
-            self.analyzer.add_keywords(keywords)
+
+            # 批量导入后整体重新排序一次
+            self._sorted_keywords = None
             self.update_keyword_list()
-            
-            logger.info(f"成功导入 {len(keywords)} 个关键词")
+
+            logger.info("成功导入 %s 个关键词", len(keywords))
             self.update_status(f"成功导入 {len(keywords)} 个关键词")
             messagebox.showinfo('成功', f'已成功导入 {len(keywords)} 个关键词！')
-            
-        except Exception as e:
+
+        def on_error(e):
             error_msg = f"导入关键词失败：{str(e)}"
             logger.error(error_msg)
-            logger.error(traceback.format_exc())
             self.update_status(error_msg)
             messagebox.showerror('错误', error_msg)
 
+        self.run_in_background(task, on_done, on_error, widgets=self.keyword_task_widgets)
+
     def clear_keywords(self):
         """清空所有关键词"""
         if messagebox.askyesno('确认', '确定要删除所有关键词吗？'):
             count = len(self.analyzer.keywords)
-            logger.info(f"清空所有关键词，共 {count} 个")
-            self.analyzer.keywords.clear()
-            self.analyzer.save_keywords([])
+            logger.info("清空所有关键词，共 %s 个", count)
+            # 通过分析器清空，以便同时使已构建的关键词自动机失效
+            self.analyzer.clear_keywords()
+            self._sorted_keywords = []
             self.update_keyword_list()
             self.update_status(f"已清空所有关键词，共 {count} 个")
 
@@ -321,7 +421,7 @@ class TenderAnalyzerGUI:
             filetypes=[('招标文档', '*.pdf;*.docx'), ('所有文件', '*.*')]
         )
         if file_path:
-            logger.info(f"选择文件: {file_path}")
+            logger.info("选择文件: %s", file_path)
             self.file_path_var.set(file_path)
             self.update_status(f"已选择文件: {os.path.basename(file_path)}")
 
@@ -336,39 +436,72 @@ class TenderAnalyzerGUI:
             messagebox.showwarning('警告', '请先添加关键词！')
             return
 
+        logger.info("开始分析文档: %s", file_path)
+        self.update_status("正在分析文档...")
+        # 清空现有结果
+        self._cancel_result_population()
+        self.result_tree.delete(*self.result_tree.get_children())
+        self._last_results = None
+
+        # 在后台线程中分析文档，避免界面卡死
+        self.run_in_background(
+            lambda: self.analyzer.process_document(file_path),
+            lambda results: self._show_analysis_results(file_path, results),
+            self._on_analysis_error,
+            widgets=self.keyword_task_widgets
+        )
+
+    def _show_analysis_results(self, file_path, results):
+        """显示分析结果"""
         try:
-            logger.info(f"开始分析文档: {file_path}")
-            self.update_status("正在分析文档...")
-            # 清空现有结果
-            for item in self.result_tree.get_children():
-                self.result_tree.delete(item)
-
-            # 分析文档
-            results = self.analyzer.process_document(file_path)
-            
-            # 显示结果
-            for i, result in enumerate(results, 1):
-                self.result_tree.insert('', tk.END, values=(
-                    i,
-                    result.get('section', ''),
-                    result['page'],
-                    result['keyword'],
-                    result['text']
-                ))
-            
-            logger.info(f"分析完成，找到 {len(results)} 个匹配结果")
+            self._populate_result_tree(list(iter_result_rows(results)))
+            self._last_results = results
+
+            logger.info("分析完成，找到 %s 个匹配结果", len(results))
             self.update_status(f"分析完成，找到 {len(results)} 个匹配结果")
-            
+
         except Exception as e:
-            error_msg = f"处理文档时出错：{str(e)}"
-            logger.error(error_msg)
-            logger.error(traceback.format_exc())
-            self.update_status(f"错误：{str(e)}")
-            messagebox.showerror('错误', error_msg)
+            logger.exception("显示分析结果失败")
+            self._on_analysis_error(e)
+
+    def _populate_result_tree(self, rows, start=0):
+        """分批插入结果行，每批之间让出事件循环，避免一次性插入大量行导致界面卡顿"""
+        end = start + RESULT_INSERT_CHUNK
+        tree_path = str(self.result_tree)
+        script = '\n'.join(
+            f"{tree_path} insert {{}} end -values [list {' '.join(map(_tcl_quote, row))}]"
+            for row in rows[start:end]
+        )
+        try:
+            self.root.tk.eval(script)
+        except tk.TclError as e:
+            # 脚本执行中途失败时，前面的行已经插入，剩余的行逐行插入
+            logger.warning("批量插入结果失败，改为逐行插入: %s", e)
+            inserted = len(self.result_tree.get_children()) - start
+            for row in rows[start + inserted:end]:
+                self.result_tree.insert('', tk.END, values=row)
+
+        if end < len(rows):
+            self._populate_job = self.root.after_idle(self._populate_result_tree, rows, end)
+        else:
+            self._populate_job = None
+
+    def _cancel_result_population(self):
+        """取消尚未完成的分批插入任务"""
+        if self._populate_job is not None:
+            self.root.after_cancel(self._populate_job)
+            self._populate_job = None
+
+    def _on_analysis_error(self, e):
+        """分析失败时提示用户"""
+        error_msg = f"处理文档时出错：{str(e)}"
+        logger.error(error_msg)
+        self.update_status(f"错误：{str(e)}")
+        messagebox.showerror('错误', error_msg)
 
     def export_results(self):
         """导出结果到Excel文件"""
-        if not self.result_tree.get_children():
+        if not self._last_results and not self.result_tree.get_children():
             messagebox.showwarning('警告', '没有可导出的结果！')
             return
 
@@ -379,43 +512,41 @@ class TenderAnalyzerGUI:
         if not file_path:
             return
 
-        try:
-            logger.info(f"开始导出结果到: {file_path}")
-            self.update_status("正在导出结果...")
-            # 获取所有结果
-            data = []
-            for item in self.result_tree.get_children():
-                values = self.result_tree.item(item)['values']
-                data.append({
-                    '序号': values[0],
-                    '章节': values[1],
-                    '页码': values[2],
-                    '关键词': values[3],
-                    '内容': values[4]
-                })
+        logger.info("开始导出结果到: %s", file_path)
+        self.update_status("正在导出结果...")
+        if self._last_results is not None:
+            rows = iter_result_rows(self._last_results)
+        else:
+            # 没有缓存的分析结果时从表格读取（Treeview只能在主线程中访问）
+            rows = [
+                tuple(self.result_tree.item(item)['values'])
+                for item in self.result_tree.get_children()
+            ]
 
+        def task():
             # 导出到Excel
-            df = pd.DataFrame(data)
-            df.to_excel(file_path, index=False)
-            
+            write_rows_to_excel(rows, file_path)
+
+        def on_done(_):
             logger.info("导出完成")
             self.update_status("导出完成")
             messagebox.showinfo('成功', '结果已成功导出！')
-        except Exception as e:
+
+        def on_error(e):
             error_msg = f"导出失败：{str(e)}"
             logger.error(error_msg)
-            logger.error(traceback.format_exc())
             self.update_status(f"导出失败：{str(e)}")
             messagebox.showerror('错误', error_msg)
 
+        self.run_in_background(task, on_done, on_error, widgets=(self.export_btn,))
+
     def run(self):
         """运行GUI程序"""
         logger.info("启动主循环")
         try:
             self.root.mainloop()
         except Exception as e:
-            logger.error(f"主循环异常: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("主循环异常: %s", e)
         finally:
             logger.info("程序结束")
 
@@ -426,11 +557,11 @@ def process_command_line(doc_file=None, keywords_file=None, output_file=None):
         
         # 如果提供了关键词文件，导入关键词
         if keywords_file:
-            logger.info(f"从文件导入关键词: {keywords_file}")
+            logger.info("从文件导入关键词: %s", keywords_file)
             keywords = TenderAnalyzerGUI.process_keywords_file(keywords_file)
             if keywords:
                 analyzer.add_keywords(keywords)
-                logger.info(f"成功导入 {len(keywords)} 个关键词")
+                logger.info("成功导入 %s 个关键词", len(keywords))
             else:
                 logger.error("关键词文件中没有找到有效的关键词")
                 return False
@@ -441,31 +572,20 @@ def process_command_line(doc_file=None, keywords_file=None, output_file=None):
                 logger.error("没有可用的关键词，请先提供关键词文件")
                 return False
                 
-            logger.info(f"开始分析文档: {doc_file}")
+            logger.info("开始分析文档: %s", doc_file)
             results = analyzer.process_document(doc_file)
-            logger.info(f"分析完成，找到 {len(results)} 个匹配结果")
+            logger.info("分析完成，找到 %s 个匹配结果", len(results))
             
             # 如果提供了输出文件，导出结果
             if output_file:
-                logger.info(f"开始导出结果到: {output_file}")
-                data = []
-                for i, result in enumerate(results, 1):
-                    data.append({
-                        '序号': i,
-                        '章节': result.get('section', ''),
-                        '页码': result['page'],
-                        '关键词': result['keyword'],
-                        '内容': result['text']
-                    })
-                df = pd.DataFrame(data)
-                df.to_excel(output_file, index=False)
+                logger.info("开始导出结果到: %s", output_file)
+                write_rows_to_excel(iter_result_rows(results), output_file)
                 logger.info("导出完成")
                 
         return True
             
     except Exception as e:
-        logger.error(f"命令行处理出错: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("命令行处理出错: %s", e)
         return False
 
 def main():
@@ -478,7 +598,8 @@ def main():
     parser.add_argument('-g', '--gui', action='store_true', help='启动图形界面')
     
     args = parser.parse_args()
-    
+    setup_logger()
+
     try:
         # 如果指定了GUI模式或没有提供任何参数，启动GUI
         if args.gui or (not args.doc and not args.keywords and not args.output):
@@ -494,11 +615,12 @@ def main():
                 sys.exit(1)
                 
     except Exception as e:
-        logger.error(f"程序运行出错: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("程序运行出错: %s", e)
         if args.gui:
             messagebox.showerror("错误", f"程序运行出错：{str(e)}")
         sys.exit(1)
 
 if __name__ == '__main__':
+    # 打包为可执行文件后，PDF多进程提取需要freeze_support
+    multiprocessing.freeze_support()
     main()
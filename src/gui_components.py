@@ -1,8 +1,74 @@
 """SQLite数据库管理界面"""
+import csv
 import tkinter as tk
+from contextlib import contextmanager
 from tkinter import ttk
 from typing import Optional, Callable
 
+# 搜索框停止输入多久（毫秒）后才执行搜索，避免每次按键都遍历整个列表
+SEARCH_DEBOUNCE_MS = 150
+# 分类筛选框中表示不限分类的选项
+ALL_CATEGORIES = "全部分类"
+# 列表每次插入的行数，其余的行在滚动到接近底部时再插入
+RENDER_CHUNK_ROWS = 200
+# 关键词和项目列表每页从数据库读取的行数
+KEYWORDS_PAGE_SIZE = 200
+PROJECTS_PAGE_SIZE = 100
+
+# 屏幕尺寸，第一次打开对话框时查询
+_screen_size = None
+
+def center_dialog(dialog, parent, width, height):
+    """设置对话框大小并居中显示在屏幕上"""
+    global _screen_size
+    if _screen_size is None:
+        _screen_size = (parent.winfo_screenwidth(), parent.winfo_screenheight())
+    x = (_screen_size[0] - width) // 2
+    y = (_screen_size[1] - height) // 2
+    dialog.geometry(f"{width}x{height}+{x}+{y}")
+
+class LazyTreeview:
+    """按需插入行的Treeview
+    
+    先只插入前RENDER_CHUNK_ROWS行，滚动到接近底部时再插入下一批，
+    行数很多时打开或筛选列表的耗时只与插入的行数有关。
+    """
+    
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        # 全部行各列的值，以及已插入Treeview的行数
+        self._rows = []
+        self._rendered = 0
+        self._render_pending = False
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+    
+    def set_rows(self, rows):
+        """替换列表中的全部行（rows为每行各列的值）"""
+        self.tree.delete(*self.tree.get_children())
+        self._rows = rows
+        self._rendered = 0
+        self._render_more()
+    
+    def _render_more(self):
+        """插入下一批行"""
+        self._render_pending = False
+        end = min(self._rendered + RENDER_CHUNK_ROWS, len(self._rows))
+        # 批量插入期间不更新滚动条，插入完成后再统一刷新
+        self.tree.configure(yscrollcommand="")
+        for values in self._rows[self._rendered:end]:
+            self.tree.insert("", tk.END, values=values)
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        self._rendered = end
+    
+    def _on_yscroll(self, first, last):
+        """更新滚动条，接近底部且还有未插入的行时插入下一批"""
+        self.scrollbar.set(first, last)
+        if (not self._render_pending and self._rendered < len(self._rows)
+                and float(last) >= 0.9):
+            self._render_pending = True
+            self.tree.after_idle(self._render_more)
+
 class DatabaseManagerFrame(ttk.Frame):
     """数据库管理界面框架"""
     
@@ -18,17 +84,33 @@ class DatabaseManagerFrame(ttk.Frame):
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # 创建关键词管理标签页
-        self.keywords_frame = KeywordsManagerFrame(self.notebook, self.db)
-        self.notebook.add(self.keywords_frame, text="关键词管理")
-        
-        # 创建项目摘要标签页
-        self.projects_frame = ProjectSummaryFrame(self.notebook, self.db)
-        self.notebook.add(self.projects_frame, text="项目摘要")
-        
-        # 创建统计摘要标签页
-        self.stats_frame = StatisticsFrame(self.notebook, self.db)
-        self.notebook.add(self.stats_frame, text="统计摘要")
+        # 关键词管理、项目摘要、统计摘要标签页先放空白的占位框架，
+        # 第一次切换到该页时才创建页面并从数据库加载数据
+        self._tabs = {}
+        for attr, frame_class, text in (
+            ("keywords_frame", KeywordsManagerFrame, "关键词管理"),
+            ("projects_frame", ProjectSummaryFrame, "项目摘要"),
+            ("stats_frame", StatisticsFrame, "统计摘要"),
+        ):
+            setattr(self, attr, None)
+            placeholder = ttk.Frame(self.notebook)
+            self.notebook.add(placeholder, text=text)
+            self._tabs[str(placeholder)] = (attr, frame_class, placeholder)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.on_tab_changed()
+    
+    def on_tab_changed(self, event=None):
+        """切换标签页时创建尚未创建的页面"""
+        attr, frame_class, placeholder = self._tabs[self.notebook.select()]
+        frame = getattr(self, attr)
+        if frame is None:
+            frame = frame_class(placeholder, self.db)
+            frame.pack(fill=tk.BOTH, expand=True)
+            setattr(self, attr, frame)
+        elif isinstance(frame, StatisticsFrame):
+            # 数据库没有变化时刷新统计不会重新查询
+            frame.refresh_stats()
 
 class KeywordsManagerFrame(ttk.Frame):
     """关键词管理界面"""
@@ -36,6 +118,15 @@ class KeywordsManagerFrame(ttk.Frame):
     def __init__(self, parent, db_manager):
         super().__init__(parent)
         self.db = db_manager
+        # 尚未执行的延迟搜索
+        self._search_after_id = None
+        # 全部行（各列的值, 小写的搜索文本），以及上一次的搜索词和匹配的行
+        self._rows = []
+        self._last_query = ""
+        self._matched = []
+        # 当前页码（从0开始）以及是否还有下一页
+        self._page = 0
+        self._has_next_page = False
         self.setup_ui()
         
     def setup_ui(self):
@@ -50,14 +141,33 @@ class KeywordsManagerFrame(ttk.Frame):
         ttk.Button(toolbar, text="导入关键词", command=self.import_keywords).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="导出关键词", command=self.export_keywords).pack(side=tk.LEFT, padx=2)
         
+        # 翻页
+        self.next_button = ttk.Button(toolbar, text="下一页", command=self.next_page)
+        self.next_button.pack(side=tk.RIGHT, padx=2)
+        self.page_label = ttk.Label(toolbar)
+        self.page_label.pack(side=tk.RIGHT, padx=5)
+        self.prev_button = ttk.Button(toolbar, text="上一页", command=self.prev_page)
+        self.prev_button.pack(side=tk.RIGHT, padx=2)
+        
         # 搜索框
         search_frame = ttk.Frame(self)
         search_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(search_frame, text="搜索:").pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self.on_search)
+        self._search_trace = self.search_var.trace_add("write", self.on_search)
+        
+        # 分类筛选
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        self.category_box = ttk.Combobox(
+            search_frame, textvariable=self.category_var, state="readonly", width=15
+        )
+        self.category_box.bind("<<ComboboxSelected>>", self.on_category_change)
+        self.category_box.pack(side=tk.RIGHT, padx=5)
+        ttk.Label(search_frame, text="分类:").pack(side=tk.RIGHT)
+        
         ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(search_frame, text="清除", command=self.clear_search).pack(side=tk.LEFT)
         
         # 关键词列表
         self.tree = ttk.Treeview(
@@ -79,50 +189,138 @@ class KeywordsManagerFrame(ttk.Frame):
         self.tree.column("created_at", width=150)
         
         # 添加滚动条
-        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.rows_view = LazyTreeview(self.tree, self.scrollbar)
         
         # 放置组件
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # 加载关键词
         self.load_keywords()
     
+    @staticmethod
+    def _make_row(keyword):
+        """把数据库中的关键词转换为（各列的值, 小写的搜索文本）"""
+        return (
+            (
+                keyword["keyword"],
+                keyword["category"],
+                keyword["description"],
+                keyword["created_at"]
+            ),
+            # 字段之间用不可见的分隔符连接，避免搜索词跨字段匹配
+            "\x1f".join(
+                str(keyword[field] or "") for field in ("keyword", "category", "description")
+            ).lower()
+        )
+    
     def load_keywords(self):
         """加载关键词列表"""
-        # 清空现有内容
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # 从数据库加载关键词
-        keywords = self.db.get_all_keywords()
-        for keyword in keywords:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    keyword["keyword"],
-                    keyword["category"],
-                    keyword["description"],
-                    keyword["created_at"]
-                )
+        # 从数据库加载当前页的关键词，多取一条用于判断是否还有下一页
+        keywords = self.db.get_all_keywords(
+            limit=KEYWORDS_PAGE_SIZE + 1, offset=self._page * KEYWORDS_PAGE_SIZE
+        )
+        if not keywords and self._page > 0:
+            # 删除关键词后当前页可能已经没有数据，改为显示最后一页
+            self._page = max(0, (self.db.count_keywords() - 1) // KEYWORDS_PAGE_SIZE)
+            keywords = self.db.get_all_keywords(
+                limit=KEYWORDS_PAGE_SIZE + 1, offset=self._page * KEYWORDS_PAGE_SIZE
             )
+        self._has_next_page = len(keywords) > KEYWORDS_PAGE_SIZE
+        self._rows = [self._make_row(keyword) for keyword in keywords[:KEYWORDS_PAGE_SIZE]]
+        
+        categories = self.db.get_keyword_categories()
+        self.category_box["values"] = [ALL_CATEGORIES] + categories
+        if self.category_var.get() not in categories:
+            self.category_var.set(ALL_CATEGORIES)
+        
+        # 按当前分类和搜索词重新显示列表
+        self._last_query = ""
+        self._do_search()
+    
+    def prev_page(self):
+        """显示上一页关键词"""
+        if self._page > 0:
+            self._page -= 1
+            self.load_keywords()
+    
+    def next_page(self):
+        """显示下一页关键词"""
+        if self._has_next_page:
+            self._page += 1
+            self.load_keywords()
+    
+    def _selected_category(self):
+        """当前筛选的分类，不限分类时返回None"""
+        category = self.category_var.get()
+        return None if category == ALL_CATEGORIES else category
+    
+    def _category_rows(self):
+        """没有搜索词时显示的行：不限分类时为当前页，否则为该分类的全部关键词"""
+        category = self._selected_category()
+        if category is None:
+            return self._rows
+        return [self._make_row(keyword) for keyword in self.db.search_keywords("", category)]
+    
+    def on_category_change(self, event=None):
+        """切换分类后重新筛选"""
+        self._last_query = ""
+        self._do_search()
     
     def on_search(self, *args):
+        """搜索框内容变化时延迟执行搜索，连续输入只搜索最后一次的内容"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._do_search)
+    
+    @contextmanager
+    def _suspend_search_trace(self):
+        """在代码中修改搜索框内容时暂停监听，避免触发多余的搜索"""
+        self.search_var.trace_remove("write", self._search_trace)
+        try:
+            yield
+        finally:
+            self._search_trace = self.search_var.trace_add("write", self.on_search)
+    
+    def clear_search(self):
+        """清空搜索框并立即显示全部行"""
+        with self._suspend_search_trace():
+            self.search_var.set("")
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._do_search()
+    
+    def _do_search(self):
         """搜索关键词"""
+        self._search_after_id = None
         search_term = self.search_var.get().lower()
+        # 以空白分隔的多个词须全部出现
+        tokens = search_term.split()
         
-        for item in self.tree.get_children():
-            values = self.tree.item(item)["values"]
-            if (
-                search_term in str(values[0]).lower() or  # 关键词
-                search_term in str(values[1]).lower() or  # 分类
-                search_term in str(values[2]).lower()     # 描述
-            ):
-                self.tree.reattach(item, "", tk.END)
-            else:
-                self.tree.detach(item)
+        if self._last_query and search_term.startswith(self._last_query):
+            # 搜索词是上一次的延长时，只有上一次匹配的行可能匹配，在其中继续筛选
+            self._matched = [
+                row for row in self._matched if all(token in row[1] for token in tokens)
+            ]
+        elif search_term:
+            # 否则由数据库（全文索引或LIKE）在全部关键词的关键词、分类、描述中搜索
+            self._matched = [
+                self._make_row(keyword)
+                for keyword in self.db.search_keywords(search_term, self._selected_category())
+            ]
+        else:
+            self._matched = self._category_rows()
+        self._last_query = search_term
+        self.rows_view.set_rows([values for values, _ in self._matched])
+        
+        # 搜索或按分类筛选时显示全部匹配结果，不分页
+        paging = not search_term and self._selected_category() is None
+        self.page_label.configure(text=f"第 {self._page + 1} 页" if paging else "全部匹配")
+        self.prev_button.configure(state=tk.NORMAL if paging and self._page > 0 else tk.DISABLED)
+        self.next_button.configure(
+            state=tk.NORMAL if paging and self._has_next_page else tk.DISABLED
+        )
     
     def add_keyword(self):
         """添加新关键词"""
@@ -198,20 +396,21 @@ class KeywordsManagerFrame(ttk.Frame):
             return
             
         try:
-            count = 0
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parts = line.strip().split('\t')
-                    if not parts[0]:
+            rows = []
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                # 每行为“关键词<Tab>分类<Tab>描述”，分类和描述可省略
+                for parts in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                    parts = [part.strip() for part in parts]
+                    if not parts or not parts[0]:
                         continue
                     
                     keyword = parts[0]
                     category = parts[1] if len(parts) > 1 else ""
                     description = parts[2] if len(parts) > 2 else ""
-                    
-                    if self.db.add_keyword(keyword, category, description):
-                        count += 1
-                        
+                    rows.append((keyword, category, description))
+            
+            # 全部关键词在一个事务中写入，已存在的关键词会被忽略
+            count = self.db.add_keywords_bulk(rows)
             self.load_keywords()
             tk.messagebox.showinfo("成功", f"成功导入{count}个关键词")
         except Exception as e:
@@ -235,8 +434,11 @@ class KeywordsManagerFrame(ttk.Frame):
         try:
             keywords = self.db.get_all_keywords()
             with open(file_path, 'w', encoding='utf-8') as f:
-                for kw in keywords:
-                    f.write(f"{kw['keyword']}\t{kw['category']}\t{kw['description']}\n")
+                # 所有行拼接后一次写入，没有分类或描述时写为空
+                f.write("".join(
+                    f"{kw['keyword']}\t{kw['category'] or ''}\t{kw['description'] or ''}\n"
+                    for kw in keywords
+                ))
             tk.messagebox.showinfo("成功", "关键词导出完成")
         except Exception as e:
             tk.messagebox.showerror("错误", f"导出关键词失败：{str(e)}")
@@ -247,6 +449,15 @@ class ProjectSummaryFrame(ttk.Frame):
     def __init__(self, parent, db_manager):
         super().__init__(parent)
         self.db = db_manager
+        # 尚未执行的延迟搜索
+        self._search_after_id = None
+        # 全部行（各列的值, 小写的搜索文本），以及上一次的搜索词和匹配的行
+        self._rows = []
+        self._last_query = ""
+        self._matched = []
+        # 当前页码（从0开始）以及是否还有下一页
+        self._page = 0
+        self._has_next_page = False
         self.setup_ui()
         
     def setup_ui(self):
@@ -259,14 +470,23 @@ class ProjectSummaryFrame(ttk.Frame):
         ttk.Button(toolbar, text="导出列表", command=self.export_list).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="查看详情", command=self.show_detail).pack(side=tk.LEFT, padx=2)
         
+        # 翻页
+        self.next_button = ttk.Button(toolbar, text="下一页", command=self.next_page)
+        self.next_button.pack(side=tk.RIGHT, padx=2)
+        self.page_label = ttk.Label(toolbar)
+        self.page_label.pack(side=tk.RIGHT, padx=5)
+        self.prev_button = ttk.Button(toolbar, text="上一页", command=self.prev_page)
+        self.prev_button.pack(side=tk.RIGHT, padx=2)
+        
         # 搜索框
         search_frame = ttk.Frame(self)
         search_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(search_frame, text="搜索:").pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self.on_search)
+        self._search_trace = self.search_var.trace_add("write", self.on_search)
         ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(search_frame, text="清除", command=self.clear_search).pack(side=tk.LEFT)
         
         # 项目列表
         self.tree = ttk.Treeview(
@@ -290,50 +510,104 @@ class ProjectSummaryFrame(ttk.Frame):
         self.tree.column("status", width=100)
         
         # 添加滚动条
-        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.rows_view = LazyTreeview(self.tree, self.scrollbar)
         
         # 放置组件
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # 加载项目列表
         self.load_projects()
     
     def load_projects(self):
         """加载项目列表"""
-        # 清空现有内容
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # 从数据库加载项目
-        projects = self.db.get_project_summaries()
-        for project in projects:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
+        # 从数据库加载当前页的项目，多取一条用于判断是否还有下一页；
+        # 列表不显示关键词统计，不解析其JSON
+        projects = self.db.get_project_summaries(
+            limit=PROJECTS_PAGE_SIZE + 1, offset=self._page * PROJECTS_PAGE_SIZE, raw_json=True
+        )
+        if not projects and self._page > 0:
+            self._page = 0
+            projects = self.db.get_project_summaries(limit=PROJECTS_PAGE_SIZE + 1, raw_json=True)
+        self._has_next_page = len(projects) > PROJECTS_PAGE_SIZE
+        del projects[PROJECTS_PAGE_SIZE:]
+        self.page_label.configure(text=f"第 {self._page + 1} 页")
+        self.prev_button.configure(state=tk.NORMAL if self._page > 0 else tk.DISABLED)
+        self.next_button.configure(state=tk.NORMAL if self._has_next_page else tk.DISABLED)
+        self._rows = [
+            (
+                (
                     project["id"],
                     project["project_name"],
                     project["analysis_date"],
                     project["total_keywords"],
                     project["status"]
-                )
+                ),
+                # 字段之间用不可见的分隔符连接，避免搜索词跨字段匹配
+                "\x1f".join(
+                    str(project[field] or "") for field in ("project_name", "status")
+                ).lower()
             )
+            for project in projects
+        ]
+        
+        # 按当前搜索词重新显示列表
+        self._last_query = ""
+        self._matched = self._rows
+        self._do_search()
     
     def on_search(self, *args):
-        """搜索项目"""
+        """搜索框内容变化时延迟执行搜索，连续输入只搜索最后一次的内容"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._do_search)
+    
+    @contextmanager
+    def _suspend_search_trace(self):
+        """在代码中修改搜索框内容时暂停监听，避免触发多余的搜索"""
+        self.search_var.trace_remove("write", self._search_trace)
+        try:
+            yield
+        finally:
+            self._search_trace = self.search_var.trace_add("write", self.on_search)
+    
+    def clear_search(self):
+        """清空搜索框并立即显示全部行"""
+        with self._suspend_search_trace():
+            self.search_var.set("")
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._do_search()
+    
+    def _do_search(self):
+        """在当前页中搜索项目"""
+        self._search_after_id = None
         search_term = self.search_var.get().lower()
+        # 以空白分隔的多个词须全部出现
+        tokens = search_term.split()
         
-        for item in self.tree.get_children():
-            values = self.tree.item(item)["values"]
-            if (
-                search_term in str(values[1]).lower() or  # 项目名称
-                search_term in str(values[4]).lower()     # 状态
-            ):
-                self.tree.reattach(item, "", tk.END)
-            else:
-                self.tree.detach(item)
+        # 搜索词是上一次的延长时，只有上一次匹配的行可能匹配，否则筛选全部行
+        if search_term.startswith(self._last_query):
+            candidates = self._matched
+        else:
+            candidates = self._rows
+        # 在项目名称、状态中搜索
+        self._matched = [row for row in candidates if all(token in row[1] for token in tokens)]
+        self._last_query = search_term
+        self.rows_view.set_rows([values for values, _ in self._matched])
+    
+    def prev_page(self):
+        """显示上一页项目"""
+        if self._page > 0:
+            self._page -= 1
+            self.load_projects()
+    
+    def next_page(self):
+        """显示下一页项目"""
+        if self._has_next_page:
+            self._page += 1
+            self.load_projects()
     
     def refresh_list(self):
         """刷新项目列表"""
@@ -371,15 +645,7 @@ class KeywordDialog:
         self.dialog.grab_set()
         
         # 居中显示
-        window_width = 400
-        window_height = 300
-        screen_width = parent.winfo_screenwidth()
-        screen_height = parent.winfo_screenheight()
-        
-        x = (screen_width - window_width) // 2
-        y = (screen_height - window_height) // 2
-        
-        self.dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        center_dialog(self.dialog, parent, 400, 300)
         
         # 创建表单
         self.create_form(initial or {})
@@ -431,15 +697,7 @@ class ProjectDetailDialog:
         self.dialog.grab_set()
         
         # 居中显示
-        window_width = 600
-        window_height = 400
-        screen_width = parent.winfo_screenwidth()
-        screen_height = parent.winfo_screenheight()
-        
-        x = (screen_width - window_width) // 2
-        y = (screen_height - window_height) // 2
-        
-        self.dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        center_dialog(self.dialog, parent, 600, 400)
         
         # 显示项目详情
         self.show_project_detail(project)
@@ -453,11 +711,15 @@ class ProjectDetailDialog:
         info_frame = ttk.LabelFrame(self.dialog, text="基本信息")
         info_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Label(info_frame, text=f"项目名称: {project['project_name']}").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Label(info_frame, text=f"分析日期: {project['analysis_date']}").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Label(info_frame, text=f"文件类型: {project['file_type']}").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Label(info_frame, text=f"文件大小: {project['file_size']} 字节").pack(anchor=tk.W, padx=5, pady=2)
-        ttk.Label(info_frame, text=f"状态: {project['status']}").pack(anchor=tk.W, padx=5, pady=2)
+        # 各项信息放在同一个多行标签中
+        info_text = "\n".join((
+            f"项目名称: {project['project_name']}",
+            f"分析日期: {project['analysis_date']}",
+            f"文件类型: {project['file_type']}",
+            f"文件大小: {project['file_size']} 字节",
+            f"状态: {project['status']}",
+        ))
+        ttk.Label(info_frame, text=info_text, justify=tk.LEFT).pack(anchor=tk.W, padx=5, pady=2)
         
         # 关键词统计
         stats_frame = ttk.LabelFrame(self.dialog, text="关键词统计")
@@ -476,13 +738,12 @@ class ProjectDetailDialog:
         tree.column("keyword", width=200)
         tree.column("count", width=100)
         
-        # 添加数据
-        for keyword, count in project['keyword_stats'].items():
-            tree.insert("", tk.END, values=(keyword, count))
-        
         # 添加滚动条
         scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        
+        # 添加数据：按出现次数从多到少排列，关键词很多时滚动到底部再继续插入
+        rows = sorted(project['keyword_stats'].items(), key=lambda item: (-item[1], item[0]))
+        LazyTreeview(tree, scrollbar).set_rows(rows)
         
         # 放置组件
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -497,6 +758,8 @@ class StatisticsFrame(ttk.Frame):
     def __init__(self, parent, db_manager):
         super().__init__(parent)
         self.db = db_manager
+        # 当前显示的统计数据对应的数据库变更版本
+        self._stats_version = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -548,12 +811,14 @@ class StatisticsFrame(ttk.Frame):
         self.tree.column("total_occurrences", width=150)
         
         # 添加滚动条
-        scrollbar = ttk.Scrollbar(keyword_stats_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(
+            keyword_stats_frame, orient=tk.VERTICAL, command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
         
         # 放置组件
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # 添加刷新按钮
         ttk.Button(self, text="刷新统计", command=self.refresh_stats).pack(pady=5)
@@ -563,93 +828,44 @@ class StatisticsFrame(ttk.Frame):
     
     def refresh_stats(self):
         """刷新统计数据"""
-        # 获取数据
-        keywords = self.db.get_all_keywords()
-        projects = self.db.get_project_summaries(limit=1000)  # 获取所有项目
-        
-        # 按项目名称合并相同项目的多次分析结果
-        project_stats = {}
-        unique_projects = set()
-        for project in projects:
-            project_name = project.get('project_name', '')
-            if project_name:
-                unique_projects.add(project_name)
-                stats = project.get('keyword_stats', {})
-                if project_name not in project_stats:
-                    project_stats[project_name] = {
-                        'keyword_stats': {},
-                        'latest_date': project['analysis_date']
-                    }
-                else:
-                    # 如果是同一个项目的多次分析，只保留最新的结果
-                    if project['analysis_date'] > project_stats[project_name]['latest_date']:
-                        project_stats[project_name] = {
-                            'keyword_stats': {},
-                            'latest_date': project['analysis_date']
-                        }
-                
-                # 只有是最新分析时才统计关键词
-                if project['analysis_date'] == project_stats[project_name]['latest_date']:
-                    project_stats[project_name]['keyword_stats'] = stats
+        # 数据库没有任何写入时，显示的统计数据仍然有效，无需重新查询
+        version = self.db.get_change_version()
+        if version is not None and version == self._stats_version:
+            return
+        self._stats_version = version
+        
+        # 获取数据（同名项目的多次分析由数据库合并，只保留最近一次）
+        project_stats = self.db.get_project_usage_stats()
         
         # 更新总体统计
-        self.total_keywords_var.set(str(len(keywords)))
-        self.total_projects_var.set(str(len(unique_projects)))  # 显示唯一项目数
-        
-        # 计算关键词使用统计
-        keyword_stats = {}
-        total_matches = 0
-        
-        for project_name, project_data in project_stats.items():
-            stats = project_data['keyword_stats']
-            for keyword, count in stats.items():
-                if keyword not in keyword_stats:
-                    keyword_stats[keyword] = {'usage_count': 0, 'project_count': 0}
-                keyword_stats[keyword]['usage_count'] += count
-                keyword_stats[keyword]['project_count'] += 1
-                total_matches += count
+        self.total_keywords_var.set(str(self.db.count_keywords()))
+        self.total_projects_var.set(str(len(project_stats)))  # 显示唯一项目数
         
         # 更新匹配总次数
+        total_matches = sum(p['total_occurrences'] for p in project_stats)
         self.total_matches_var.set(str(total_matches))
         
         # 计算平均每项目关键词数
-        if unique_projects:
-            avg = sum(len(p['keyword_stats']) for p in project_stats.values()) / len(unique_projects)
+        if project_stats:
+            avg = sum(p['total_keywords'] for p in project_stats) / len(project_stats)
             self.avg_keywords_per_project_var.set(f"{avg:.2f}")
         else:
             self.avg_keywords_per_project_var.set("0")
         
-        # 更新表格数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # 准备项目统计信息
-        project_info = []
-        for project_name, project_data in project_stats.items():
-            stats = project_data['keyword_stats']
-            # 计算该项目的统计信息
-            total_occurrences = sum(stats.values())  # 关键词总出现次数
-            unique_keywords = len(stats)  # 不同关键词数量
-            
-            project_info.append({
-                'project_name': project_name,
-                'analysis_date': project_data['latest_date'],
-                'keywords_found': unique_keywords,
-                'total_occurrences': total_occurrences
-            })
-        
-        # 按总出现次数降序排序
-        project_info.sort(key=lambda x: x['total_occurrences'], reverse=True)
-        
-        # 填充表格
-        for info in project_info:
+        # 更新表格数据，一次调用删除全部行
+        self.tree.delete(*self.tree.get_children())
+        
+        # 填充表格（已按总出现次数降序排列），批量插入期间不更新滚动条
+        self.tree.configure(yscrollcommand="")
+        for info in project_stats:
             self.tree.insert(
                 "",
                 tk.END,
                 values=(
                     info['project_name'],
                     info['analysis_date'],
-                    info['keywords_found'],
+                    info['total_keywords'],
                     info['total_occurrences']
                 )
             )
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
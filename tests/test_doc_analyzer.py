@@ -4,7 +4,9 @@ import os
 import pytest
 import pandas as pd
 from pathlib import Path
+from src import doc_analyzer
 from src.doc_analyzer import DocumentAnalyzer
+from src.database import DatabaseManager
 
 # 测试文件路径
 TEST_FILES_DIR = Path(__file__).parent / "test_files"
@@ -97,5 +99,213 @@ def test_results_export():
     # 清理测试文件
     os.remove(output_file)
 
+@pytest.fixture
+def temp_analyzer(tmp_path, monkeypatch):
+    """使用临时数据库的DocumentAnalyzer"""
+    monkeypatch.setattr(
+        "src.doc_analyzer.DatabaseManager",
+        lambda: DatabaseManager(tmp_path / "analysis.db")
+    )
+    return DocumentAnalyzer()
+
+def test_find_relevant_paragraphs(temp_analyzer):
+    """测试关键词所在句子的提取"""
+    temp_analyzer.add_keywords(["投标", "Keyword"])
+    pages_content = [
+        {'page': 1, 'content': '总则。投标人须缴纳保证金！The KEYWORD is here. 其他内容'},
+        {'page': 2, 'content': '无关内容。'}
+    ]
+
+    results = temp_analyzer.find_relevant_paragraphs(pages_content)
+    found = {(r['page'], r['keyword'], r['text']) for r in results}
+    assert found == {
+        (1, '投标', '投标人须缴纳保证金！'),
+        (1, 'Keyword', 'The KEYWORD is here.')
+    }
+
+def test_keyword_mutation_refreshes_matches(temp_analyzer):
+    """测试关键词变化后重新匹配"""
+    pages_content = [{'page': 1, 'content': '投标人须缴纳保证金。'}]
+    temp_analyzer.add_keywords(["投标"])
+    assert len(temp_analyzer.find_relevant_paragraphs(pages_content)) == 1
+
+    temp_analyzer.remove_keywords(["投标"])
+    assert temp_analyzer.find_relevant_paragraphs(pages_content) == []
+
+def test_clear_keywords(temp_analyzer):
+    """测试清空关键词"""
+    pages_content = [{'page': 1, 'content': '投标人须缴纳保证金。'}]
+    temp_analyzer.add_keywords(["投标", "保证金"])
+    assert temp_analyzer.find_relevant_paragraphs(pages_content)
+
+    temp_analyzer.clear_keywords()
+    assert temp_analyzer.keywords == set()
+    assert temp_analyzer.db.get_all_keywords() == []
+    assert temp_analyzer.find_relevant_paragraphs(pages_content) == []
+
+def test_keyword_scan_without_ahocorasick(temp_analyzer, monkeypatch):
+    """测试未安装pyahocorasick时的正则回退扫描"""
+    monkeypatch.setattr("src.doc_analyzer.ahocorasick", None)
+    temp_analyzer.add_keywords(["投标", "投标人", "保证金"])
+    matches = set(temp_analyzer._iter_keyword_matches("投标人须缴纳保证金"))
+    assert matches == {(0, "投标"), (0, "投标人"), (6, "保证金")}
+
+def test_keywords_differing_only_by_case(temp_analyzer, monkeypatch):
+    """测试仅大小写不同的关键词都能被匹配到"""
+    temp_analyzer.add_keywords(["Bond", "bond"])
+    expected = [(4, "Bond"), (4, "bond")]
+    if doc_analyzer.ahocorasick is not None:
+        assert list(temp_analyzer._iter_keyword_matches("the bond")) == expected
+    monkeypatch.setattr("src.doc_analyzer.ahocorasick", None)
+    assert list(temp_analyzer._iter_keyword_matches("the bond")) == expected
+
+def test_overlapping_keywords_same_with_both_backends(temp_analyzer, monkeypatch):
+    """测试关键词重叠时，自动机和正则回退的匹配顺序及结果一致"""
+    pages_content = [{'page': 1, 'content': '招标人须缴纳保证金。'}]
+    temp_analyzer.add_keywords(["招标", "招标人", "标人", "保证金"])
+    expected = [(0, "招标人"), (0, "招标"), (1, "标人"), (6, "保证金")]
+    backends = [None]
+    if doc_analyzer.ahocorasick is not None:
+        backends.insert(0, doc_analyzer.ahocorasick)
+    for backend in backends:
+        monkeypatch.setattr("src.doc_analyzer.ahocorasick", backend)
+        assert list(temp_analyzer._iter_keyword_matches("招标人须缴纳保证金")) == expected
+        results = temp_analyzer.find_relevant_paragraphs(pages_content)
+        assert [(r['text'], r['keyword']) for r in results] == [("招标人须缴纳保证金。", "招标人")]
+
+def test_process_document_uses_cache(temp_analyzer, tmp_path, monkeypatch):
+    """测试同一文档、同一组关键词的分析结果缓存"""
+    from docx import Document
+    docx_file = tmp_path / "tender.docx"
+    doc = Document()
+    doc.add_paragraph("投标人须缴纳保证金。")
+    doc.save(str(docx_file))
+
+    temp_analyzer.add_keywords(["保证金"])
+    results = temp_analyzer.process_document(str(docx_file))
+    assert [r['text'] for r in results] == ["投标人须缴纳保证金。"]
+
+    def fail(path):
+        raise AssertionError("命中缓存时不应重新提取文本")
+    monkeypatch.setattr(temp_analyzer, "extract_text_from_docx", fail)
+    assert temp_analyzer.process_document(str(docx_file)) == results
+
+    # 关键词变化后重新分析
+    monkeypatch.delattr(temp_analyzer, "extract_text_from_docx")
+    temp_analyzer.add_keywords(["投标"])
+    assert len(temp_analyzer.process_document(str(docx_file))) == 1
+
+def test_process_document_reuses_extracted_text(temp_analyzer, tmp_path, monkeypatch):
+    """测试关键词变化后复用缓存的文档文本"""
+    from docx import Document
+    docx_file = tmp_path / "tender.docx"
+    doc = Document()
+    doc.add_paragraph("投标人须缴纳保证金。")
+    doc.add_paragraph("开标时间另行通知。")
+    doc.save(str(docx_file))
+
+    temp_analyzer.add_keywords(["保证金"])
+    assert len(temp_analyzer.process_document(str(docx_file))) == 1
+
+    def fail(path):
+        raise AssertionError("文本已缓存时不应重新解析文档")
+    monkeypatch.setattr(temp_analyzer, "extract_text_from_docx", fail)
+    temp_analyzer.add_keywords(["开标"])
+    assert [r['keyword'] for r in temp_analyzer.process_document(str(docx_file))] == ["保证金", "开标"]
+
+def test_search_projects(tmp_path):
+    """测试项目搜索（全文索引与短搜索词的LIKE回退）"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    db.add_project_summary("某市道路工程招标文件", "a.pdf", {"投标": 2}, "pdf", 100)
+    db.add_project_summary("设备采购项目", "b.docx", {}, "docx", 200, notes="含招标附件")
+
+    assert [p["project_name"] for p in db.search_projects("道路工程")] == ["某市道路工程招标文件"]
+    assert {p["project_name"] for p in db.search_projects("招标")} == {"某市道路工程招标文件", "设备采购项目"}
+    assert db.search_projects("不存在的项目") == []
+    db.close()
+
+def test_search_keywords(tmp_path):
+    """测试关键词搜索（全文索引随增删改同步，短搜索词使用LIKE）"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    db.add_keyword("投标保证金", "财务", "投标时缴纳")
+    db.add_keyword("资格审查", "资格", "")
+    db.add_keyword("Tender", "商务", "英文关键词")
+
+    assert [kw["keyword"] for kw in db.search_keywords("保证金")] == ["投标保证金"]
+    assert [kw["keyword"] for kw in db.search_keywords("投标")] == ["投标保证金"]
+    assert [kw["keyword"] for kw in db.search_keywords("tender")] == ["Tender"]
+    assert {kw["keyword"] for kw in db.search_keywords("关键词")} == {"Tender"}
+    assert db.search_keywords("投标保证金", category="商务") == []
+    assert [kw["keyword"] for kw in db.search_keywords("投标", category="财务")] == ["投标保证金"]
+    # 多个词须全部出现，长词走全文索引、短词走LIKE
+    assert [kw["keyword"] for kw in db.search_keywords("保证金 缴纳")] == ["投标保证金"]
+    assert [kw["keyword"] for kw in db.search_keywords("tender 英文")] == ["Tender"]
+    assert db.search_keywords("保证金 英文") == []
+
+    db.update_keyword("资格审查", "资格预审", "资格", "")
+    assert [kw["keyword"] for kw in db.search_keywords("资格预审")] == ["资格预审"]
+    assert db.search_keywords("资格审查") == []
+    db.delete_keyword("投标保证金")
+    assert db.search_keywords("保证金") == []
+    db.close()
+
+def test_project_usage_stats(tmp_path):
+    """测试同名项目只统计最近一次分析"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    first = db.add_project_summary("项目A", "a.pdf", {"投标": 5}, "pdf", 100)
+    db.add_project_summary("项目A", "a.pdf", {"投标": 1, "保证金": 2}, "pdf", 100)
+    db.add_project_summary("项目B", "b.pdf", {"投标": 4}, "pdf", 100)
+    # 让第一次分析的日期更晚，验证按分析日期而不是插入顺序取最近一次
+    with db.transaction() as conn:
+        conn.execute(
+            "UPDATE project_summaries SET analysis_date = '2999-01-01 00:00:00' WHERE id = ?",
+            (first,)
+        )
+
+    stats = db.get_project_usage_stats()
+    assert [(p["project_name"], p["total_keywords"], p["total_occurrences"]) for p in stats] == [
+        ("项目A", 1, 5),
+        ("项目B", 1, 4),
+    ]
+    db.close()
+
+def test_keyword_pagination(tmp_path):
+    """测试关键词分页读取、计数和分类列表"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    db.add_keywords_bulk([("投标", "商务", ""), ("保证金", "财务", ""), ("工期", None, None)])
+
+    pages = [db.get_all_keywords(limit=2, offset=offset) for offset in (0, 2, 4)]
+    assert [len(page) for page in pages] == [2, 1, 0]
+    paged = [kw["keyword"] for page in pages for kw in page]
+    assert paged == [kw["keyword"] for kw in db.get_all_keywords()]
+    assert db.count_keywords() == 3
+    assert db.get_keyword_categories() == sorted(["商务", "财务"])
+    db.close()
+
+def test_change_version(tmp_path):
+    """测试只有写入数据库后变更版本才会变化"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    version = db.get_change_version()
+    db.get_all_keywords()
+    assert db.get_change_version() == version
+    db.add_keyword("投标")
+    assert db.get_change_version() != version
+    db.close()
+
+def test_database_transaction(tmp_path):
+    """测试嵌套事务只在最外层提交，异常时整体回滚"""
+    db = DatabaseManager(tmp_path / "analysis.db")
+    with db.transaction():
+        db.add_keyword("投标")
+        db.add_keyword("保证金")
+    assert {kw["keyword"] for kw in db.get_all_keywords()} == {"投标", "保证金"}
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.delete_keyword("投标")
+            raise RuntimeError("中断")
+    assert {kw["keyword"] for kw in db.get_all_keywords()} == {"投标", "保证金"}
+    db.close()
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])